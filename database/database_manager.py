@@ -6,6 +6,7 @@ Handles SpatiaLite database operations
 
 import os
 import sqlite3
+from contextlib import contextmanager
 from datetime import datetime
 from qgis.core import QgsDataSourceUri, QgsVectorLayer, QgsProject, QgsCoordinateReferenceSystem
 from qgis.PyQt.QtCore import QObject, pyqtSignal
@@ -23,6 +24,7 @@ class DatabaseManager(QObject):
         self.db_path = db_path
         self.crs = QgsCoordinateReferenceSystem("EPSG:32648")  # UTM Zone 48N for Bintan
         self.spatialite_available = False
+        self._transaction_depth = 0
     
     def is_connected(self):
         """Check if database is connected"""
@@ -57,6 +59,7 @@ class DatabaseManager(QObject):
             self.spatialite_available = spatialite_loaded
             self.db_path = db_path
             self.connection.row_factory = sqlite3.Row
+            self.configure_connection()
             
             # Choose schema based on SpatiaLite availability
             if spatialite_loaded:
@@ -115,12 +118,29 @@ class DatabaseManager(QObject):
                 
             self.db_path = db_path
             self.connection.row_factory = sqlite3.Row
+            self.configure_connection()
             return True
             
         except Exception as e:
             self.db_error.emit(str(e))
             return False
     
+    def configure_connection(self):
+        """Tune the connection for the plugin's queries
+        
+        The database usually lives in a cloud sync folder that is copied file by
+        file, often on a network filesystem, so it keeps the rollback (DELETE)
+        journal: every commit is complete in the .sqlite file itself. WAL would
+        leave committed rows in a -wal sidecar that the sync copies separately.
+        Setting the mode also converts databases previously switched to WAL.
+        Memory-mapped I/O stays off for the same reason, SQLite documents it as
+        unsafe on network filesystems and under I/O errors.
+        Saves group their writes with transaction() to keep the fsyncs down.
+        """
+        cursor = self.connection.cursor()
+        cursor.execute("PRAGMA journal_mode = DELETE")
+        cursor.execute("PRAGMA temp_store = MEMORY")
+    
     def close(self):
         """Close database connection"""
         if self.connection:
@@ -143,6 +163,22 @@ class DatabaseManager(QObject):
             self.db_error.emit(str(e))
             return None
     
+    def execute_query_iter(self, query, params=None):
+        """Execute a query and yield result rows one at a time as dicts"""
+        if not self.connection:
+            return
+            
+        try:
+            cursor = self.connection.cursor()
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+            for row in cursor:
+                yield dict(row)
+        except Exception as e:
+            self.db_error.emit(str(e))
+    
     def execute_update(self, query, params=None):
         """Execute an update/insert query"""
         if not self.connection:
@@ -159,7 +195,8 @@ class DatabaseManager(QObject):
                 cursor.execute(query, params)
             else:
                 cursor.execute(query)
-            self.connection.commit()
+            if not self._transaction_depth:
+                self.connection.commit()
             lastrowid = cursor.lastrowid
             print(f"DEBUG: Query executed successfully, lastrowid: {lastrowid}")
             return lastrowid if lastrowid else True
@@ -167,10 +204,65 @@ class DatabaseManager(QObject):
             error_msg = f"Database error: {str(e)}\nQuery: {query}\nParams: {params}"
             self.db_error.emit(error_msg)
             print(f"DEBUG: {error_msg}")
+            # Inside a transaction, let transaction() roll back the whole block
+            if self._transaction_depth:
+                raise
             if self.connection:
                 self.connection.rollback()
             return False
     
+    def execute_many(self, query, params_seq):
+        """Execute the same insert/update for many parameter tuples in one transaction"""
+        if not self.connection:
+            self.db_error.emit("No database connection")
+            return False
+        
+        try:
+            cursor = self.connection.cursor()
+            cursor.executemany(query, params_seq)
+            if not self._transaction_depth:
+                self.connection.commit()
+            return True
+        except Exception as e:
+            self.db_error.emit(f"Database error: {str(e)}\nQuery: {query}")
+            if self._transaction_depth:
+                raise
+            self.connection.rollback()
+            return False
+    
+    @contextmanager
+    def transaction(self):
+        """Run the enclosed updates as one transaction, committed when the block exits
+        
+        Inside the block execute_update and execute_many raise their errors instead
+        of returning False, so a failed statement rolls back everything written in
+        the block and the exception propagates to the caller. Nested blocks use
+        savepoints: an exception caught around an inner block only undoes that block.
+        """
+        if self._transaction_depth:
+            savepoint = f"sp_{self._transaction_depth}"
+            self.connection.execute(f"SAVEPOINT {savepoint}")
+        else:
+            savepoint = None
+            self.connection.execute("BEGIN IMMEDIATE")
+        self._transaction_depth += 1
+        try:
+            yield self
+        except Exception:
+            self._transaction_depth -= 1
+            if savepoint:
+                self.connection.execute(f"ROLLBACK TO {savepoint}")
+                self.connection.execute(f"RELEASE {savepoint}")
+            else:
+                self.connection.rollback()
+            raise
+        else:
+            self._transaction_depth -= 1
+            if savepoint:
+                self.connection.execute(f"RELEASE {savepoint}")
+            else:
+                self.connection.commit()
+    
     def add_layers_to_qgis(self, layers=None):
         """Add database layers to QGIS project"""
         if not self.db_path:
@@ -0,0 +1,6 @@
+-- Migration: indexes for the cost summaries (Supabase 'costs' table)
+-- Serve the per-site date filters and ORDER BY month DESC LIMIT 12 queries
+-- of the costs widget without a full table scan and sort
+
+CREATE INDEX IF NOT EXISTS idx_costs_site_date ON costs(site_id, cost_date);
+CREATE INDEX IF NOT EXISTS idx_costs_site_category ON costs(site_id, category);
@@ -0,0 +1,5 @@
+-- Migration: index for dive number generation on existing databases
+-- Serves the per-site ORDER BY dive_date DESC, dive_number DESC LIMIT 1 lookup
+-- of the dive log dialog with an index seek instead of a full table scan
+
+CREATE INDEX IF NOT EXISTS idx_dive_logs_site_date ON dive_logs(site_id, dive_date, dive_number);
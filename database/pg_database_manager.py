@@ -6,6 +6,8 @@ import psycopg2
 from psycopg2.extras import RealDictCursor
 from PyQt5.QtCore import QSettings
 import os
+from contextlib import contextmanager
+from uuid import uuid4
 from typing import Dict, Any, List, Optional
 
 class PostgreSQLDatabaseManager:
@@ -24,6 +26,7 @@ class PostgreSQLDatabaseManager:
         
         self.connection = None
         self.media_path_manager = None
+        self._transaction_depth = 0
     
     def set_media_path_manager(self, media_path_manager):
         """Set media path manager"""
@@ -46,6 +49,27 @@ class PostgreSQLDatabaseManager:
             cur.execute(query, params)
             return cur.fetchall()
     
+    def execute_query_iter(self, query: str, params: tuple = None, itersize: int = 1000):
+        """Execute SELECT query through a server-side cursor and yield rows
+        
+        Accepts the '?' placeholders the SQLite queries use.
+        """
+        if params:
+            query = query.replace('%', '%%').replace('?', '%s')
+        self.connect()
+        try:
+            # Named cursors live until the transaction ends, a unique name lets
+            # several iterators overlap
+            with self.connection.cursor(name=f"shipwreck_iter_{uuid4().hex}",
+                                        cursor_factory=RealDictCursor) as cur:
+                cur.itersize = itersize
+                cur.execute(query, params)
+                yield from cur
+        finally:
+            # Don't leave the session idle in transaction after the last row
+            if not self._transaction_depth and not self.connection.closed:
+                self.connection.rollback()
+    
     def execute_insert(self, query: str, params: tuple = None) -> int:
         """Execute INSERT query and return ID"""
         self.connect()
@@ -55,7 +79,8 @@ class PostgreSQLDatabaseManager:
                 query += ' RETURNING id'
             cur.execute(query, params)
             result = cur.fetchone()
-            self.connection.commit()
+            if not self._transaction_depth:
+                self.connection.commit()
             return result[0] if result else None
     
     def execute_update(self, query: str, params: tuple = None) -> int:
@@ -64,9 +89,53 @@ class PostgreSQLDatabaseManager:
         with self.connection.cursor() as cur:
             cur.execute(query, params)
             rows_affected = cur.rowcount
-            self.connection.commit()
+            if not self._transaction_depth:
+                self.connection.commit()
             return rows_affected
     
+    def execute_many(self, query: str, params_seq: List[tuple]) -> int:
+        """Execute INSERT/UPDATE query for many parameter tuples in one transaction"""
+        self.connect()
+        with self.connection.cursor() as cur:
+            cur.executemany(query, params_seq)
+            rows_affected = cur.rowcount
+            if not self._transaction_depth:
+                self.connection.commit()
+            return rows_affected
+    
+    @contextmanager
+    def transaction(self):
+        """Run the enclosed updates as one transaction, committed when the block exits
+        
+        Any exception leaving the block, such as a failed add_media, rolls back what
+        the block wrote and propagates to the caller. Nested blocks use savepoints:
+        an exception caught around an inner block only undoes that block.
+        """
+        self.connect()
+        savepoint = f"sp_{self._transaction_depth}" if self._transaction_depth else None
+        if savepoint:
+            with self.connection.cursor() as cur:
+                cur.execute(f"SAVEPOINT {savepoint}")
+        self._transaction_depth += 1
+        try:
+            yield self
+        except Exception:
+            self._transaction_depth -= 1
+            if savepoint:
+                with self.connection.cursor() as cur:
+                    cur.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+                    cur.execute(f"RELEASE SAVEPOINT {savepoint}")
+            else:
+                self.connection.rollback()
+            raise
+        else:
+            self._transaction_depth -= 1
+            if savepoint:
+                with self.connection.cursor() as cur:
+                    cur.execute(f"RELEASE SAVEPOINT {savepoint}")
+            else:
+                self.connection.commit()
+    
     # Site methods
     def get_sites(self) -> List[Dict]:
         """Get all sites with PostGIS geometry"""
@@ -285,12 +354,16 @@ class PostgreSQLDatabaseManager:
                     VALUES (%s, %s, %s)
                 """, (media_id, related_type, related_id))
                 
-                self.connection.commit()
+                # Inside transaction() the media is committed with the enclosing block
+                if not self._transaction_depth:
+                    self.connection.commit()
                 return media_id
                 
-        except Exception as e:
-            self.connection.rollback()
-            raise e
+        except Exception:
+            # Inside transaction() the enclosing block rolls back and reports the error
+            if not self._transaction_depth:
+                self.connection.rollback()
+            raise
     
     def delete_media(self, media_id: int) -> bool:
         """Delete media (cascades to relations)"""
@@ -232,8 +232,11 @@ INSERT INTO settings (key, value) VALUES
 -- Indexes for performance
 CREATE INDEX idx_finds_date ON finds(find_date);
 CREATE INDEX idx_dive_logs_date ON dive_logs(dive_date);
+CREATE INDEX idx_dive_logs_site_date ON dive_logs(site_id, dive_date, dive_number);
 CREATE INDEX idx_work_sessions_date ON work_sessions(work_date);
 CREATE INDEX idx_expenses_date ON expenses(expense_date);
+CREATE INDEX idx_expenses_site_date ON expenses(site_id, expense_date);
+CREATE INDEX idx_expenses_site_category ON expenses(site_id, category);
 CREATE INDEX idx_telegram_sync ON telegram_sync_queue(processed, created_at);
 
 -- Views for common queries
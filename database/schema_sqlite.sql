@@ -126,6 +126,8 @@ CREATE TABLE dive_logs (
     FOREIGN KEY (site_id) REFERENCES sites(id)
 );
 
+CREATE INDEX idx_dive_logs_site_date ON dive_logs(site_id, dive_date, dive_number);
+
 -- Dive team members
 CREATE TABLE dive_team (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -193,6 +195,9 @@ CREATE TABLE expenses (
     FOREIGN KEY (site_id) REFERENCES sites(id)
 );
 
+CREATE INDEX idx_expenses_site_date ON expenses(site_id, expense_date);
+CREATE INDEX idx_expenses_site_category ON expenses(site_id, category);
+
 -- Telegram sync queue
 CREATE TABLE telegram_sync_queue (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
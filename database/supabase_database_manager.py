@@ -12,6 +12,7 @@ except ImportError:
 
 from PyQt5.QtCore import QSettings, QObject, pyqtSignal
 import os
+from contextlib import contextmanager
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 from qgis.core import QgsMessageLog, Qgis
@@ -891,8 +892,38 @@ class SupabaseDatabaseManager(QObject):
                                 totals[cat] = 0
                             totals[cat] += cost['amount']
                         
-                        # Return as list of dicts
-                        return [{'category': k, 'total': v} for k, v in sorted(totals.items(), key=lambda x: x[1], reverse=True)]
+                        # Return as list of dicts, each carrying the overall total
+                        grand = sum(totals.values())
+                        return [{'category': k, 'total': v, 'grand': grand} for k, v in sorted(totals.items(), key=lambda x: x[1], reverse=True)]
+                    elif "group by month" in query_lower:
+                        # Monthly totals - the API has no GROUP BY, so only fetch
+                        # the two needed columns and sum them per month
+                        site_id = params[0] if params else None
+                        costs_query = self.supabase.table('costs').select("cost_date, amount") \
+                            .order('cost_date', desc=True)
+                        if site_id:
+                            costs_query = costs_query.eq('site_id', site_id)
+                        costs = costs_query.execute()
+                        
+                        # Rows arrive newest first, so months are already in
+                        # ORDER BY month DESC order and LIMIT can stop early
+                        limit = int(query_lower.rsplit(" limit ", 1)[1]) if " limit " in query_lower else None
+                        totals = {}
+                        for cost in costs.data:
+                            month = (cost.get('cost_date') or '')[:7]
+                            if not month:
+                                continue
+                            if month not in totals and len(totals) == limit:
+                                break
+                            totals[month] = totals.get(month, 0) + (cost.get('amount') or 0)
+                        
+                        return [{'month': k, 'expenses': v, 'labor': 0}
+                                for k, v in totals.items()]
+                    elif "where id = ?" in query_lower and params:
+                        # Single cost - only fetch the requested columns
+                        columns = query_lower[len("select"):query_lower.find(" from ")].strip()
+                        response = self.supabase.table('costs').select(columns).eq('id', params[0]).execute()
+                        return response.data
                     elif "where site_id = ?" in query_lower and params:
                         response = self.supabase.table('costs').select("*").eq('site_id', params[0]).execute()
                         return response.data
@@ -931,7 +962,15 @@ class SupabaseDatabaseManager(QObject):
                         return response.data
                         
                 elif "from dive_team" in query_lower:
-                    if "where dive_id = ?" in query_lower and params:
+                    if "join workers" in query_lower and params:
+                        # Team members with their worker names in one request
+                        response = self.supabase.table('dive_team').select("worker_id, role, workers(full_name)").eq('dive_id', params[0]).execute()
+                        return [{
+                            'worker_id': m['worker_id'],
+                            'role': m.get('role'),
+                            'full_name': m['workers']['full_name'] if m.get('workers') else ''
+                        } for m in response.data or []]
+                    elif "where dive_id = ?" in query_lower and params:
                         response = self.supabase.table('dive_team').select("*").eq('dive_id', params[0]).execute()
                         return response.data
                     else:
@@ -947,6 +986,51 @@ class SupabaseDatabaseManager(QObject):
             self.db_error.emit(error_msg)
             return []
     
+    def execute_query_iter(self, query: str, params: tuple = None, page_size: int = 1000):
+        """Yield rows of a simple query page by page
+        
+        Handles 'SELECT columns FROM table [WHERE site_id = ?] [ORDER BY column [DESC]]',
+        with 'column AS alias' in the column list. Errors are reported and re-raised.
+        """
+        try:
+            query_lower = " ".join(query.lower().split())
+            columns, _, rest = query_lower[len("select "):].partition(" from ")
+            table = rest.split()[0]
+            site_id = params[0] if params and "where site_id = ?" in rest else None
+            
+            # PostgREST spells 'column AS alias' as 'alias:column'
+            select = []
+            for column in columns.split(","):
+                name, _, alias = column.strip().partition(" as ")
+                select.append(f"{alias}:{name}" if alias else name)
+            select = ",".join(select)
+            
+            order = None
+            if " order by " in rest:
+                order_terms = rest.split(" order by ", 1)[1].split()
+                order = (order_terms[0], order_terms[1:2] == ["desc"])
+            
+            offset = 0
+            while True:
+                request = self.supabase.table(table).select(select)
+                if site_id is not None:
+                    request = request.eq('site_id', site_id)
+                if order:
+                    request = request.order(order[0], desc=order[1])
+                response = request.range(offset, offset + page_size - 1).execute()
+                rows = response.data or []
+                yield from rows
+                if len(rows) < page_size:
+                    break
+                offset += page_size
+                
+        except Exception as e:
+            error_msg = f"Error executing query: {e}"
+            print(error_msg)
+            self.db_error.emit(error_msg)
+            # Let the caller fail instead of taking the missing rows for an empty result
+            raise
+    
     def execute_update(self, query: str, params: tuple = None) -> bool:
         """Execute SQL-like update/delete query by translating to Supabase API calls"""
         try:
@@ -1096,6 +1180,38 @@ class SupabaseDatabaseManager(QObject):
             self.db_error.emit(error_msg)
             return False
     
+    def execute_many(self, query: str, params_seq: List[tuple]) -> bool:
+        """Execute SQL-like INSERT for many rows with a single API call"""
+        try:
+            query_lower = query.lower().strip()
+            if not query_lower.startswith("insert into") or not params_seq:
+                return False
+            
+            # Extract table and column names from query
+            table = query_lower[len("insert into"):query_lower.find('(')].strip()
+            start = query.find('(') + 1
+            end = query.find(')')
+            columns = [col.strip() for col in query[start:end].split(',')]
+            
+            rows = [dict(zip(columns, params)) for params in params_seq]
+            self.supabase.table(table).insert(rows).execute()
+            return True
+            
+        except Exception as e:
+            error_msg = f"Error executing bulk insert: {e}"
+            print(error_msg)
+            self.db_error.emit(error_msg)
+            return False
+    
+    @contextmanager
+    def transaction(self):
+        """Group updates like the SQL managers do
+        
+        The REST API has no multi-request transactions, so each update is still
+        applied on its own; callers can use the same code for every backend.
+        """
+        yield self
+    
     # Test connection
     def test_connection(self) -> tuple[bool, str]:
         """Test database connection"""
@@ -156,10 +156,10 @@ class ShipwreckExcavation:
                 QMessageBox.critical(
                     self.iface.mainWindow(),
                     self.tr("Dependency Error"),
-                    self.tr(f"Could not install dependencies automatically.\n\n"
-                           f"Error: {str(e)}\n\n"
-                           f"Please install manually using:\n"
-                           f"pip install supabase pillow reportlab qrcode python-dateutil requests")
+                    self.tr("Could not install dependencies automatically.\n\n"
+                           "Error: {0}\n\n"
+                           "Please install manually using:\n"
+                           "pip install supabase pillow reportlab qrcode python-dateutil requests").format(str(e))
                 )
                 return
         
@@ -220,7 +220,7 @@ class ShipwreckExcavation:
             if self.db_manager.connect(saved_db_path):
                 self.iface.messageBar().pushMessage(
                     self.tr("Info"),
-                    self.tr(f"Loaded saved database: {os.path.basename(saved_db_path)}"),
+                    self.tr("Loaded saved database: {0}").format(os.path.basename(saved_db_path)),
                     level=Qgis.Info,
                     duration=3
                 )
@@ -243,6 +243,12 @@ class ShipwreckExcavation:
         # Stop telegram sync
         if self.telegram_sync:
             self.telegram_sync.stop()
+        
+        # Release what the database settings dialog keeps open, if it was used
+        settings_dialog = sys.modules.get('ui.database_settings_dialog')
+        if settings_dialog:
+            settings_dialog.close_sqlite_connections()
+            settings_dialog.stop_settings_writer()
 
     def run(self):
         """Run method that performs all the real work"""
@@ -407,13 +413,13 @@ class ShipwreckExcavation:
                 QMessageBox.critical(
                     self.iface.mainWindow(),
                     self.tr("Installation Failed"),
-                    self.tr(f"Failed to install dependencies:\n{result.stderr}")
+                    self.tr("Failed to install dependencies:\n{0}").format(result.stderr)
                 )
         except Exception as e:
             QMessageBox.critical(
                 self.iface.mainWindow(),
                 self.tr("Installation Error"),
-                self.tr(f"Error installing dependencies: {str(e)}")
+                self.tr("Error installing dependencies: {0}").format(str(e))
             )
         finally:
             progress.close()
@@ -473,7 +479,7 @@ class ShipwreckExcavation:
         """Handle sync configuration"""
         self.iface.messageBar().pushMessage(
             self.tr("Cloud Sync"),
-            self.tr(f"Configured sync with {provider}"),
+            self.tr("Configured sync with {0}").format(provider),
             level=Qgis.Success,
             duration=3
         )
@@ -13,6 +13,28 @@ from pathlib import Path
 from qgis.PyQt.QtCore import QObject, QThread, pyqtSignal, QTimer, QSettings
 from qgis.core import QgsMessageLog, Qgis
 
+# Report clone progress at most once every 4 MiB copied
+CLONE_PROGRESS_INTERVAL = 4 * 1024 * 1024
+
+# Database file extensions recognised when cloning from cloud, in order of preference
+DB_EXTENSIONS = ('.sqlite', '.db')
+
+
+def find_database_file(folder):
+    """Return the path of the project database in folder, or None
+    
+    With several candidates the choice is stable: .sqlite files come before .db
+    files, then names are compared alphabetically.
+    """
+    try:
+        with os.scandir(folder) as entries:
+            candidates = [(DB_EXTENSIONS.index(os.path.splitext(e.name)[1].lower()), e.name, e.path)
+                          for e in entries
+                          if e.name.lower().endswith(DB_EXTENSIONS) and e.is_file()]
+    except OSError:
+        return None
+    return min(candidates)[2] if candidates else None
+
 class SyncWorker(QThread):
     """Worker thread for sync operations"""
     
@@ -362,13 +384,22 @@ class CloudSyncManager(QObject):
         
         return status
     
-    def clone_from_cloud(self, cloud_path, local_path, progress_callback=None):
+    def clone_from_cloud(self, cloud_path, local_path, progress_callback=None,
+                         progress_interval_bytes=CLONE_PROGRESS_INTERVAL, db_file=None,
+                         skip_db=False):
         """Clone entire project from cloud to local
         
         Args:
             cloud_path: Path to cloud folder containing database and media
             local_path: Local path where to clone
-            progress_callback: Optional callback(message, percentage)
+            progress_callback: Optional callback(message, percentage), returning
+                False cancels the clone
+            progress_interval_bytes: Minimum number of copied bytes between
+                two progress_callback calls
+            db_file: Database file in cloud_path to return the clone of,
+                by default the one chosen by find_database_file()
+            skip_db: Keep the local database as it is and only copy the other
+                files, for a local copy already known to match the cloud one
         
         Returns:
             Tuple (success, db_path, error_message)
@@ -380,37 +411,44 @@ class CloudSyncManager(QObject):
                 return False, None, f"Cloud path not found: {cloud_path}"
             
             # Find database file
-            db_files = list(cloud_path.glob('*.sqlite')) + list(cloud_path.glob('*.db'))
-            if not db_files:
+            if db_file is None:
+                db_file = find_database_file(cloud_path)
+            if db_file is None:
                 return False, None, "No database file found in cloud folder"
-            
-            db_file = db_files[0]  # Use first database found
+            db_file = Path(db_file)
             
             # Create local directory
             local_path = Path(local_path)
             local_path.mkdir(parents=True, exist_ok=True)
             
-            # Count total files for progress
-            total_files = sum(1 for _ in cloud_path.rglob('*') if _.is_file())
-            copied_files = 0
+            # Collect files and sizes in a single tree walk
+            source_files = [(f, f.stat().st_size)
+                            for f in cloud_path.rglob('*')
+                            if f.is_file() and not (skip_db and f == db_file)]
+            total_bytes = sum(size for _, size in source_files) or 1
+            copied_bytes = 0
+            reported_bytes = 0
             
             # Copy all files maintaining structure
-            for source_file in cloud_path.rglob('*'):
-                if source_file.is_file():
-                    # Calculate relative path
-                    rel_path = source_file.relative_to(cloud_path)
-                    dest_file = local_path / rel_path
-                    
-                    # Create destination directory
-                    dest_file.parent.mkdir(parents=True, exist_ok=True)
-                    
-                    # Copy file
-                    shutil.copy2(source_file, dest_file)
-                    
-                    copied_files += 1
-                    if progress_callback:
-                        percentage = int((copied_files / total_files) * 100)
-                        progress_callback(f"Copying {rel_path.name}", percentage)
+            for index, (source_file, size) in enumerate(source_files, 1):
+                # Calculate relative path
+                rel_path = source_file.relative_to(cloud_path)
+                dest_file = local_path / rel_path
+                
+                # Create destination directory
+                dest_file.parent.mkdir(parents=True, exist_ok=True)
+                
+                # Copy file (shutil uses the platform fast-copy syscalls)
+                shutil.copy2(source_file, dest_file)
+                
+                copied_bytes += size
+                if progress_callback and (
+                        copied_bytes - reported_bytes >= progress_interval_bytes
+                        or index == len(source_files)):
+                    reported_bytes = copied_bytes
+                    percentage = int((copied_bytes / total_bytes) * 100)
+                    if progress_callback(f"Copying {rel_path.name}", percentage) is False:
+                        return False, None, "Clone cancelled"
             
             # Return path to cloned database
             local_db_path = local_path / db_file.name
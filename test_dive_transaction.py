@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test Database Transactions
+Verifies that a failing insert inside DatabaseManager.transaction() rolls back
+everything written in the block
+Run from the QGIS Python console or with the QGIS Python interpreter
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database.database_manager import DatabaseManager
+
+def count_rows(db):
+    """Return the number of rows in the test table"""
+    return db.execute_query("SELECT COUNT(*) AS total FROM dive_test")[0]['total']
+
+def test_dive_transaction():
+    """Test rollback of a failing insert inside transaction()"""
+    print("=" * 60)
+    print("Testing Database Transactions")
+    print("=" * 60)
+    print()
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'transaction_test.sqlite')
+    db = DatabaseManager()
+    assert db.connect(db_path), "Could not open the test database"
+
+    db.execute_update(
+        "CREATE TABLE dive_test (id INTEGER PRIMARY KEY, dive_number TEXT NOT NULL UNIQUE)"
+    )
+
+    # A failing insert raises and undoes the earlier insert of the block
+    print("Failing insert inside a transaction:")
+    try:
+        with db.transaction():
+            db.execute_update("INSERT INTO dive_test (dive_number) VALUES (?)", ('D1',))
+            db.execute_update("INSERT INTO dive_test (dive_number) VALUES (?)", (None,))
+        raise AssertionError("The failing insert did not raise")
+    except Exception as e:
+        if isinstance(e, AssertionError):
+            raise
+        print(f"  ✓ Raised: {e}")
+    assert count_rows(db) == 0, "The block was not rolled back"
+    print("  ✓ No rows were committed")
+
+    # The same failure through execute_many
+    print("\nFailing execute_many inside a transaction:")
+    try:
+        with db.transaction():
+            db.execute_update("INSERT INTO dive_test (dive_number) VALUES (?)", ('D1',))
+            db.execute_many("INSERT INTO dive_test (dive_number) VALUES (?)", [('D2',), ('D2',)])
+        raise AssertionError("The failing execute_many did not raise")
+    except Exception as e:
+        if isinstance(e, AssertionError):
+            raise
+        print(f"  ✓ Raised: {e}")
+    assert count_rows(db) == 0, "The block was not rolled back"
+    print("  ✓ No rows were committed")
+
+    # A failure caught around a nested block only undoes that block
+    print("\nFailing nested block:")
+    with db.transaction():
+        db.execute_update("INSERT INTO dive_test (dive_number) VALUES (?)", ('D1',))
+        try:
+            with db.transaction():
+                db.execute_update("INSERT INTO dive_test (dive_number) VALUES (?)", ('D2',))
+                db.execute_update("INSERT INTO dive_test (dive_number) VALUES (?)", ('D1',))
+        except Exception as e:
+            print(f"  ✓ Raised: {e}")
+    assert count_rows(db) == 1, "The outer block was not committed on its own"
+    print("  ✓ Only the outer block was committed")
+
+    # Outside a transaction errors are still reported by the return value
+    print("\nFailing insert outside a transaction:")
+    assert db.execute_update("INSERT INTO dive_test (dive_number) VALUES (?)", ('D1',)) is False
+    assert count_rows(db) == 1
+    print("  ✓ Returned False and left the table unchanged")
+
+    db.close()
+    os.remove(db_path)
+
+    print()
+    print("=" * 60)
+    print("Test completed")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_dive_transaction()
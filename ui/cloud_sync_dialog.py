@@ -4,24 +4,88 @@ Cloud Sync Configuration Dialog
 """
 
 import os
+import time
+import hashlib
+from functools import partial
 from pathlib import Path
 from qgis.PyQt.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                                  QLineEdit, QPushButton, QComboBox, QCheckBox,
                                  QGroupBox, QSpinBox, QFileDialog, QMessageBox,
                                  QProgressBar, QTextEdit, QRadioButton, QButtonGroup,
                                  QProgressDialog, QApplication)
-from qgis.PyQt.QtCore import Qt, pyqtSignal
-from qgis.PyQt.QtGui import QIcon
+from qgis.PyQt.QtCore import Qt, pyqtSignal, QSignalBlocker
+from qgis.PyQt.QtGui import QIcon, QTextCursor
+from sync.cloud_sync_manager import find_database_file
+
+# Cloud providers in provider_combo order
+PROVIDERS = [
+    "Dropbox",
+    "Google Drive",
+    "OneDrive",
+    "Cartella di rete",
+    "Cartella locale (test)"
+]
+
+# Translation table removing spaces when normalizing provider names
+_STRIP_SPACE = str.maketrans("", "", " ")
+
+# Seconds a successful connection test is reused for the same provider/path
+PROBE_CACHE_SECONDS = 30
+
+# Bytes of database header hashed to detect an already cloned copy
+FINGERPRINT_BYTES = 64 * 1024
+
+
+def _db_fingerprint(path):
+    """Return (size, header digest) identifying a database file's content
+    
+    The header holds SQLite's file change counter, which every commit in
+    rollback journal mode increments.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        digest = hashlib.blake2b(f.read(FINGERPRINT_BYTES), digest_size=16).digest()
+    return size, digest
+
+
+def _same_database(local_db, cloud_db):
+    """Return True when local_db is known to hold the same data as cloud_db"""
+    # Commits still in a WAL sidecar leave the header and size unchanged
+    if any(os.path.exists(path + '-wal') for path in (local_db, cloud_db)):
+        return False
+    try:
+        return _db_fingerprint(local_db) == _db_fingerprint(cloud_db)
+    except OSError:
+        # Unreadable, e.g. a cloud placeholder not downloaded yet
+        return False
+
+
+def _file_digest(path):
+    """Return the BLAKE2b digest of a whole file"""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.digest()
+
 
 class CloudSyncDialog(QDialog):
     """Dialog for cloud sync configuration"""
     
     sync_configured = pyqtSignal(str, str)  # provider, path
     
+    # Normalized provider key -> index in provider_combo
+    _PROVIDER_KEY_TO_INDEX = {
+        p.lower().translate(_STRIP_SPACE): i for i, p in enumerate(PROVIDERS)
+    }
+    
     def __init__(self, parent=None, sync_manager=None, db_path=None):
         super().__init__(parent)
         self.sync_manager = sync_manager
         self.db_path = db_path
+        self._db_dir = os.path.dirname(db_path) if db_path else None
+        self._last_probe = None  # (provider, path, monotonic time, status lines)
+        self._dir_dialog = None  # Reused directory picker
         self.setWindowTitle("Configurazione Sincronizzazione Cloud")
         self.setModal(True)
         self.resize(600, 500)
@@ -38,13 +102,7 @@ class CloudSyncDialog(QDialog):
         provider_layout = QVBoxLayout()
         
         self.provider_combo = QComboBox()
-        self.provider_combo.addItems([
-            "Dropbox",
-            "Google Drive", 
-            "OneDrive",
-            "Cartella di rete",
-            "Cartella locale (test)"
-        ])
+        self.provider_combo.addItems(PROVIDERS)
         provider_layout.addWidget(QLabel("Seleziona provider:"))
         provider_layout.addWidget(self.provider_combo)
         
@@ -149,6 +207,9 @@ class CloudSyncDialog(QDialog):
         self.clone_btn.setIcon(QIcon.fromTheme("folder-download"))
         clone_layout.addWidget(self.clone_btn)
         
+        self.verify_clone_check = QCheckBox("Verifica integrità dopo clone")
+        clone_layout.addWidget(self.verify_clone_check)
+        
         clone_group.setLayout(clone_layout)
         layout.addWidget(clone_group)
         
@@ -179,6 +240,7 @@ class CloudSyncDialog(QDialog):
         
         # Connect signals
         self.provider_combo.currentTextChanged.connect(self.update_example_path)
+        self.path_edit.textChanged.connect(self.invalidate_probe)
         self.auto_sync_check.toggled.connect(self.interval_spin.setEnabled)
         
         if self.sync_manager:
@@ -200,10 +262,41 @@ class CloudSyncDialog(QDialog):
         example = examples.get(provider, "")
         self.example_label.setText(f"Esempio: {example}")
     
+    def _append_lines(self, lines):
+        """Append several status lines with a single document update"""
+        if not lines:
+            return
+        self.status_text.setUpdatesEnabled(False)
+        try:
+            cursor = self.status_text.textCursor()
+            cursor.movePosition(QTextCursor.End)
+            if not self.status_text.document().isEmpty():
+                cursor.insertText("\n")
+            cursor.insertText("\n".join(lines))
+            self.status_text.setTextCursor(cursor)
+        finally:
+            self.status_text.setUpdatesEnabled(True)
+    
+    def _get_dir(self, title, start):
+        """Ask for a directory reusing a single file dialog instance"""
+        if self._dir_dialog is None:
+            self._dir_dialog = QFileDialog(self)
+            self._dir_dialog.setFileMode(QFileDialog.Directory)
+            self._dir_dialog.setOption(QFileDialog.ShowDirsOnly, True)
+            self._dir_dialog.setOption(QFileDialog.DontResolveSymlinks, True)
+        
+        self._dir_dialog.setWindowTitle(title)
+        self._dir_dialog.setDirectory(start)
+        
+        if self._dir_dialog.exec_():
+            selected = self._dir_dialog.selectedFiles()
+            if selected:
+                return selected[0]
+        return ""
+    
     def browse_path(self):
         """Browse for sync path"""
-        path = QFileDialog.getExistingDirectory(
-            self,
+        path = self._get_dir(
             "Seleziona cartella di sincronizzazione",
             self.path_edit.text() or os.path.expanduser("~")
         )
@@ -223,47 +316,86 @@ class CloudSyncDialog(QDialog):
         self.status_text.clear()
         self.status_text.append(f"Test connessione {provider}...")
         
+        # Reuse a recent successful probe of the same provider/path
+        if self._last_probe:
+            probe_provider, probe_path, probe_time, probe_lines = self._last_probe
+            if (probe_provider == provider and probe_path == path
+                    and time.monotonic() - probe_time < PROBE_CACHE_SECONDS):
+                self._append_lines(probe_lines)
+                self.sync_now_btn.setEnabled(True)
+                return
+        
         # Check if path exists and is writable
         try:
             test_path = Path(path)
-            if not test_path.exists():
+            if not test_path.is_dir():
+                if test_path.exists():
+                    raise NotADirectoryError(f"{path} non è una cartella")
+                
+                reply = QMessageBox.question(
+                    self,
+                    "Cartella inesistente",
+                    f"La cartella non esiste:\n{path}\n\nVuoi crearla?",
+                    QMessageBox.Yes | QMessageBox.No
+                )
+                if reply != QMessageBox.Yes:
+                    self.status_text.append("✗ Cartella non trovata")
+                    self.sync_now_btn.setEnabled(False)
+                    return
                 test_path.mkdir(parents=True, exist_ok=True)
+            elif not os.access(path, os.W_OK):
+                raise PermissionError(f"Permessi di scrittura mancanti su {path}")
             
             # Try to write test file
             test_file = test_path / ".sync_test"
             test_file.write_text("test")
             test_file.unlink()
             
-            self.status_text.append("✓ Connessione riuscita!")
-            self.status_text.append("✓ Permessi di scrittura OK")
-            self.sync_now_btn.setEnabled(True)
-            
             # Check available space
             stat = os.statvfs(path)
             free_gb = (stat.f_bavail * stat.f_frsize) / (1024**3)
-            self.status_text.append(f"✓ Spazio disponibile: {free_gb:.1f} GB")
+            
+            lines = [
+                "✓ Connessione riuscita!",
+                "✓ Permessi di scrittura OK",
+                f"✓ Spazio disponibile: {free_gb:.1f} GB"
+            ]
+            self._append_lines(lines)
+            self.sync_now_btn.setEnabled(True)
+            self._last_probe = (provider, path, time.monotonic(), lines)
             
         except Exception as e:
+            self._last_probe = None
             self.status_text.append(f"✗ Errore: {str(e)}")
             self.sync_now_btn.setEnabled(False)
     
+    def invalidate_probe(self):
+        """Forget the cached connection test result"""
+        self._last_probe = None
+    
+    def _set_busy(self, busy):
+        """Toggle the sync-in-progress state of the dialog in one repaint"""
+        self.setUpdatesEnabled(False)
+        try:
+            self.progress_bar.setVisible(busy)
+            for button in (self.sync_now_btn, self.test_btn, self.save_btn):
+                button.setEnabled(not busy)
+        finally:
+            self.setUpdatesEnabled(True)
+    
     def sync_now(self):
         """Start sync now"""
         if not self.sync_manager:
             return
         
-        self.progress_bar.setVisible(True)
-        self.sync_now_btn.setEnabled(False)
-        self.test_btn.setEnabled(False)
-        self.save_btn.setEnabled(False)
+        self._set_busy(True)
         
         # Configure and start sync
         provider = self.provider_combo.currentText()
         path = self.path_edit.text()
         
-        if self.db_path:
-            local_path = os.path.dirname(self.db_path)
-            self.sync_manager.configure_sync(provider, path, local_path)
+        if self._db_dir:
+            self.sync_manager.configure_sync(provider, path, self._db_dir)
             self.sync_manager.start_sync()
     
     def update_progress(self, message, percentage):
@@ -273,10 +405,7 @@ class CloudSyncDialog(QDialog):
     
     def on_sync_finished(self, success, message):
         """Handle sync completion"""
-        self.progress_bar.setVisible(False)
-        self.sync_now_btn.setEnabled(True)
-        self.test_btn.setEnabled(True)
-        self.save_btn.setEnabled(True)
+        self._set_busy(False)
         
         if success:
             self.status_text.append(f"✓ {message}")
@@ -307,9 +436,8 @@ class CloudSyncDialog(QDialog):
         self.sync_manager.conflict_resolution = conflict_modes[self.conflict_group.checkedId()]
         
         # Configure sync with local path
-        if self.db_path:
-            local_path = os.path.dirname(self.db_path)
-            self.sync_manager.configure_sync(provider, path, local_path)
+        if self._db_dir:
+            self.sync_manager.configure_sync(provider, path, self._db_dir)
         
         self.sync_manager.save_settings()
         
@@ -322,20 +450,27 @@ class CloudSyncDialog(QDialog):
         if not self.sync_manager:
             return
         
-        # Load provider
-        providers = ["Dropbox", "Google Drive", "OneDrive", "Cartella di rete", "Cartella locale (test)"]
-        if self.sync_manager.sync_provider in [p.lower().replace(" ", "") for p in providers]:
-            for i, p in enumerate(providers):
-                if p.lower().replace(" ", "") == self.sync_manager.sync_provider:
-                    self.provider_combo.setCurrentIndex(i)
-                    break
-        
-        # Load path
-        self.path_edit.setText(self.sync_manager.sync_path)
+        # Block widget signals during the bulk load; dependent UI is
+        # refreshed once afterwards
+        with QSignalBlocker(self.provider_combo), \
+                QSignalBlocker(self.path_edit), \
+                QSignalBlocker(self.auto_sync_check), \
+                QSignalBlocker(self.interval_spin):
+            # Load provider
+            provider_key = (self.sync_manager.sync_provider or "").lower().translate(_STRIP_SPACE)
+            idx = self._PROVIDER_KEY_TO_INDEX.get(provider_key)
+            if idx is not None:
+                self.provider_combo.setCurrentIndex(idx)
+            
+            # Load path
+            self.path_edit.setText(self.sync_manager.sync_path)
+            
+            # Load options
+            self.auto_sync_check.setChecked(self.sync_manager.auto_sync_enabled)
+            self.interval_spin.setValue(self.sync_manager.sync_interval)
         
-        # Load options
-        self.auto_sync_check.setChecked(self.sync_manager.auto_sync_enabled)
-        self.interval_spin.setValue(self.sync_manager.sync_interval)
+        self.interval_spin.setEnabled(self.auto_sync_check.isChecked())
+        self.update_example_path()
         
         # Load conflict resolution
         conflict_modes = {'ask': 0, 'local': 1, 'remote': 2, 'newest': 3}
@@ -345,17 +480,19 @@ class CloudSyncDialog(QDialog):
         # Update status
         if self.sync_manager.sync_enabled:
             status = self.sync_manager.get_sync_status()
-            self.status_text.append(f"Provider: {status['provider']}")
-            self.status_text.append(f"Percorso: {status['path']}")
+            lines = [
+                f"Provider: {status['provider']}",
+                f"Percorso: {status['path']}"
+            ]
             if 'last_sync' in status:
-                self.status_text.append(f"Ultima sincronizzazione: {status['last_sync'].strftime('%Y-%m-%d %H:%M')}")
+                lines.append(f"Ultima sincronizzazione: {status['last_sync'].strftime('%Y-%m-%d %H:%M')}")
+            self._append_lines(lines)
             self.sync_now_btn.setEnabled(True)
     
     def clone_from_cloud(self):
         """Clone project from cloud"""
         # Get cloud path
-        cloud_path = QFileDialog.getExistingDirectory(
-            self,
+        cloud_path = self._get_dir(
             "Seleziona cartella progetto nel cloud",
             self.path_edit.text() or os.path.expanduser("~")
         )
@@ -363,11 +500,10 @@ class CloudSyncDialog(QDialog):
         if not cloud_path:
             return
         
-        # Check if it contains a database
-        cloud_path_obj = Path(cloud_path)
-        db_files = list(cloud_path_obj.glob('*.sqlite')) + list(cloud_path_obj.glob('*.db'))
+        # Check if it contains a database, chosen as the sync manager would
+        db_file = find_database_file(cloud_path)
         
-        if not db_files:
+        if db_file is None:
             QMessageBox.warning(
                 self,
                 "Nessun Database",
@@ -376,8 +512,7 @@ class CloudSyncDialog(QDialog):
             return
         
         # Get local destination
-        local_path = QFileDialog.getExistingDirectory(
-            self,
+        local_path = self._get_dir(
             "Seleziona dove salvare il progetto localmente",
             os.path.expanduser("~/Documents")
         )
@@ -385,6 +520,80 @@ class CloudSyncDialog(QDialog):
         if not local_path:
             return
         
+        # Only copy the database when the local one differs from the cloud one,
+        # the media and other files are always brought up to date
+        local_db = os.path.join(local_path, os.path.basename(db_file))
+        if os.path.isfile(local_db) and _same_database(local_db, db_file):
+            success, db_path, error = self._run_clone(
+                cloud_path, local_path, db_file, skip_db=True)
+        else:
+            # Never overwrite a different local database: keep it aside
+            conflict_db = None
+            if os.path.exists(local_db):
+                name, ext = os.path.splitext(local_db)
+                conflict_db = f"{name}.conflict-{int(time.time())}{ext}"
+                try:
+                    os.rename(local_db, conflict_db)
+                except OSError as e:
+                    QMessageBox.critical(
+                        self,
+                        "Errore Clonazione",
+                        f"Impossibile preservare il database locale esistente:\n{e}"
+                    )
+                    return
+                self.status_text.append(
+                    f"Database locale esistente salvato come {os.path.basename(conflict_db)}"
+                )
+            
+            success, db_path, error = self._run_clone(cloud_path, local_path, db_file)
+            
+            if (success and self.verify_clone_check.isChecked()
+                    and not self._verify_clone(db_file, db_path)):
+                success, error = False, (
+                    "Il database clonato non corrisponde all'originale nel cloud.\n"
+                    "Ripeti la clonazione."
+                )
+            
+            if not success:
+                self._restore_local_db(local_db, conflict_db)
+        
+        if success:
+            reply = QMessageBox.question(
+                self,
+                "Clonazione Completata",
+                f"Progetto clonato con successo!\n\n"
+                f"Database: {os.path.basename(db_path)}\n\n"
+                f"Vuoi aprire il database clonato ora?",
+                QMessageBox.Yes | QMessageBox.No
+            )
+            
+            if reply == QMessageBox.Yes:
+                # Emit signal to open database
+                from qgis.PyQt.QtCore import QTimer
+                QTimer.singleShot(100, partial(self.open_cloned_database, db_path))
+                self.accept()
+        else:
+            QMessageBox.critical(
+                self,
+                "Errore Clonazione",
+                f"Impossibile clonare il progetto:\n{error}"
+            )
+    
+    def _restore_local_db(self, local_db, conflict_db):
+        """Drop a failed or cancelled clone and put the previous local database back"""
+        try:
+            if conflict_db:
+                os.replace(conflict_db, local_db)
+                self.status_text.append(
+                    f"Database locale ripristinato: {os.path.basename(local_db)}"
+                )
+            elif os.path.exists(local_db):
+                os.remove(local_db)
+        except OSError as e:
+            self.status_text.append(f"✗ Impossibile ripristinare il database locale: {e}")
+    
+    def _run_clone(self, cloud_path, local_path, db_file, skip_db=False):
+        """Clone cloud_path into local_path showing a progress dialog"""
         # Create progress dialog
         progress = QProgressDialog(
             "Clonazione in corso...",
@@ -399,7 +608,8 @@ class CloudSyncDialog(QDialog):
         # Clone with progress callback
         def update_progress(msg, percentage):
             progress.setLabelText(msg)
-            progress.setValue(percentage)
+            if percentage != progress.value():
+                progress.setValue(percentage)
             QApplication.processEvents()
             return not progress.wasCanceled()
         
@@ -407,32 +617,26 @@ class CloudSyncDialog(QDialog):
         success, db_path, error = self.sync_manager.clone_from_cloud(
             cloud_path,
             local_path,
-            update_progress
+            update_progress,
+            db_file=db_file,
+            skip_db=skip_db
         )
         
         progress.close()
         
-        if success:
-            reply = QMessageBox.question(
-                self,
-                "Clonazione Completata",
-                f"Progetto clonato con successo!\n\n"
-                f"Database: {os.path.basename(db_path)}\n\n"
-                f"Vuoi aprire il database clonato ora?",
-                QMessageBox.Yes | QMessageBox.No
-            )
-            
-            if reply == QMessageBox.Yes:
-                # Emit signal to open database
-                from qgis.PyQt.QtCore import QTimer
-                QTimer.singleShot(100, lambda: self.open_cloned_database(db_path))
-                self.accept()
-        else:
-            QMessageBox.critical(
-                self,
-                "Errore Clonazione",
-                f"Impossibile clonare il progetto:\n{error}"
-            )
+        return success, db_path, error
+    
+    def _verify_clone(self, source, dest):
+        """Hash source and cloned file in parallel and compare them"""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        try:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                source_digest = executor.submit(_file_digest, source)
+                dest_digest = executor.submit(_file_digest, dest)
+                return source_digest.result() == dest_digest.result()
+        except OSError:
+            return False
     
     def open_cloned_database(self, db_path):
         """Open the cloned database"""
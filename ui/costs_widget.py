@@ -1,9 +1,10 @@
 # -*- coding: utf-8 -*-
 """Costs management widget"""
 
-from qgis.PyQt.QtCore import Qt, QDate, pyqtSignal
+from qgis.PyQt.QtCore import (Qt, QDate, QTimer, QThread, pyqtSignal,
+                              QAbstractTableModel, QModelIndex, QCoreApplication)
 from qgis.PyQt.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-                                QTableWidget, QTableWidgetItem, QToolBar,
+                                QTableView, QAbstractItemView, QToolBar,
                                 QLineEdit, QLabel, QMessageBox, QHeaderView,
                                 QFormLayout, QDialog, QDialogButtonBox,
                                 QTextEdit, QDateEdit, QComboBox, QTabWidget,
@@ -12,7 +13,238 @@ from qgis.PyQt.QtGui import QIcon, QFont
 # Chart imports commented out - can be enabled if QtChart is available
 # from qgis.PyQt.QtChart import QChart, QChartView, QPieSeries, QBarSeries, QBarSet, QBarCategoryAxis, QValueAxis
 from datetime import datetime, date
+from functools import lru_cache
+import csv
 import json
+import logging
+import os
+import sqlite3
+
+logger = logging.getLogger(__name__)
+
+# Amount formatter shared by all cost tables and totals, e.g. "IDR 1,234,567"
+_fmt_idr = "IDR {:,.0f}".format
+
+# Delay before a filter/period change re-queries the database
+FILTER_DEBOUNCE_MS = 150
+
+# Maximum number of cached summary/category query results
+SUMMARY_CACHE_SIZE = 16
+
+# Rows written between two progress updates during CSV export
+EXPORT_PROGRESS_ROWS = 1000
+
+# Expense columns written by ExpenseDialog, in statement parameter order
+EXPENSE_COLS = ('site_id', 'expense_date', 'category', 'description', 'supplier',
+                'amount', 'currency', 'payment_method', 'receipt_number',
+                'approved_by', 'notes')
+INSERT_EXPENSE_SQL = (f"INSERT INTO expenses ({', '.join(EXPENSE_COLS)}) "
+                      f"VALUES ({', '.join('?' * len(EXPENSE_COLS))})")
+UPDATE_EXPENSE_SQL = (f"UPDATE expenses SET {', '.join(c + ' = ?' for c in EXPENSE_COLS)} "
+                      f"WHERE id = ?")
+
+# Columns shown by ExpenseDialog, per table ('costs' is the Supabase table)
+EXPENSE_FORM_COLUMNS = {
+    'expenses': ("expense_date, category, description, supplier, amount, "
+                 "payment_method, receipt_number, approved_by, notes"),
+    'costs': "cost_date, category, description, amount, notes, created_by"
+}
+
+# Columns written to the CSV report besides the date, per expenses table
+EXPORT_COLUMNS = {
+    'expenses': ("category, description, supplier, amount, payment_method, "
+                 "receipt_number, approved_by, notes"),
+    'costs': "category, description, amount, notes, created_by"
+}
+
+def _as_dicts(rows):
+    """Normalize query results (sqlite3.Row or dict rows, or None) to dicts"""
+    if not rows:
+        return []
+    if isinstance(rows[0], dict):
+        return rows
+    return [dict(row) for row in rows]
+
+@lru_cache(maxsize=1)
+def _last_12_months(month_start):
+    """Return (label, 'YYYY-MM') tuples for the 12 months ending at month_start"""
+    months = []
+    for i in range(12):
+        year, month = month_start.year, month_start.month - i
+        if month <= 0:
+            month += 12
+            year -= 1
+        month_date = date(year, month, 1)
+        months.append((month_date.strftime("%B %Y"), month_date.strftime("%Y-%m")))
+    return tuple(months)
+
+@lru_cache(maxsize=1)
+def _bold_font():
+    """Shared bold font for total labels"""
+    font = QFont()
+    font.setBold(True)
+    return font
+
+@lru_cache(maxsize=1)
+def _bold_large_font():
+    """Shared large bold font for the grand total"""
+    font = QFont()
+    font.setPointSize(14)
+    font.setBold(True)
+    return font
+
+class CostsTableModel(QAbstractTableModel):
+    """Read-only table model holding pre-formatted rows"""
+    
+    def __init__(self, headers, parent=None):
+        super().__init__(parent)
+        self._headers = list(headers)
+        self._rows = []
+    
+    def set_rows(self, rows):
+        """Replace all rows (list of tuples of display strings)
+        
+        Rows the view already has are refreshed in place with dataChanged and
+        only the difference in row count is inserted/removed, instead of a
+        full model reset on every refresh.
+        """
+        old_count, new_count = len(self._rows), len(rows)
+        if new_count < old_count:
+            self.beginRemoveRows(QModelIndex(), new_count, old_count - 1)
+            self._rows = rows
+            self.endRemoveRows()
+        elif new_count > old_count:
+            self.beginInsertRows(QModelIndex(), old_count, new_count - 1)
+            self._rows = rows
+            self.endInsertRows()
+        else:
+            self._rows = rows
+        
+        kept = min(old_count, new_count)
+        if kept:
+            self.dataChanged.emit(self.index(0, 0),
+                                  self.index(kept - 1, len(self._headers) - 1))
+    
+    def row_values(self, row):
+        """Return the display values of a row"""
+        return self._rows[row]
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._headers)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and index.isValid():
+            return self._rows[index.row()][index.column()]
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self._headers[section]
+        return None
+
+class ExportWorker(QThread):
+    """Worker thread writing the expenses of a site to a CSV file"""
+    
+    export_progress = pyqtSignal(int)  # rows written
+    export_finished = pyqtSignal(bool, str)  # success, error message
+    
+    def __init__(self, db_manager, site_id, file_path, table_name="expenses",
+                 date_col="expense_date"):
+        super().__init__()
+        self.db_manager = db_manager
+        self.site_id = site_id
+        self.file_path = file_path
+        # Supabase keeps expenses in 'costs' with a 'cost_date' column
+        self.query = (f"SELECT {date_col} AS expense_date, {EXPORT_COLUMNS[table_name]} "
+                      f"FROM {table_name} WHERE site_id = ? ORDER BY {date_col} DESC")
+        # SQLite and psycopg2 connections must not be shared with the GUI thread -
+        # run() opens its own. Supabase requests are independent HTTP calls
+        # through its client, which may be used from several threads.
+        if isinstance(getattr(db_manager, 'connection', None), sqlite3.Connection):
+            self.db_path = db_manager.db_path
+        else:
+            self.db_path = None
+        self.connection_string = getattr(db_manager, 'connection_string', None)
+    
+    def run(self):
+        """Run export"""
+        conn = None
+        pg_manager = None
+        opened = False
+        try:
+            if self.db_path:
+                conn = sqlite3.connect(self.db_path)
+                conn.row_factory = sqlite3.Row
+                expenses = map(dict, conn.execute(self.query, (self.site_id,)))
+            elif self.connection_string:
+                # A PostgreSQL manager of our own, with its own connection
+                pg_manager = type(self.db_manager)(self.connection_string)
+                expenses = pg_manager.execute_query_iter(self.query, (self.site_id,))
+            else:
+                # Stream rows straight from the database cursor
+                expenses = self.db_manager.execute_query_iter(self.query, (self.site_id,))
+            
+            cancelled = False
+            with open(self.file_path, 'w', newline='', encoding='utf-8') as f:
+                opened = True
+                writer = csv.writer(f)
+                
+                # Header
+                writer.writerow([
+                    'Date', 'Category', 'Description', 'Supplier',
+                    'Amount (IDR)', 'Payment Method', 'Receipt #',
+                    'Approved By', 'Notes'
+                ])
+                
+                # Data
+                for count, expense in enumerate(expenses, 1):
+                    writer.writerow([
+                        expense['expense_date'],
+                        expense['category'],
+                        expense['description'],
+                        expense.get('supplier') or '',
+                        expense['amount'],
+                        expense.get('payment_method') or '',
+                        expense.get('receipt_number') or '',
+                        # Supabase costs only record who created them
+                        expense.get('approved_by', expense.get('created_by')) or '',
+                        expense['notes'] or ''
+                    ])
+                    
+                    if count % EXPORT_PROGRESS_ROWS == 0:
+                        self.export_progress.emit(count)
+                        if self.isInterruptionRequested():
+                            cancelled = True
+                            break
+            
+            if cancelled:
+                self.remove_partial_file()
+                self.export_finished.emit(False, "")
+            else:
+                self.export_finished.emit(True, "")
+        except Exception as e:
+            # A file that could not be opened was never written, leave it alone
+            if opened:
+                self.remove_partial_file()
+            self.export_finished.emit(False, str(e))
+        finally:
+            if conn:
+                conn.close()
+            if pg_manager:
+                # Finish the row generator before its connection goes away
+                expenses.close()
+                pg_manager.disconnect()
+    
+    def remove_partial_file(self):
+        """Delete the incomplete CSV of a cancelled or failed export"""
+        try:
+            os.remove(self.file_path)
+        except OSError as e:
+            logger.warning("Could not remove incomplete export %s: %s", self.file_path, e)
+
 
 class ExpenseDialog(QDialog):
     """Dialog for adding/editing expenses"""
@@ -22,6 +254,8 @@ class ExpenseDialog(QDialog):
         self.db_manager = db_manager
         self.site_id = site_id
         self.expense_id = expense_id
+        # Supabase stores expenses in the 'costs' table
+        self._table_name = "costs" if hasattr(db_manager, 'supabase') else "expenses"
         self.setWindowTitle(self.tr("Expense Entry"))
         self.setModal(True)
         self.setMinimumWidth(500)
@@ -64,6 +298,7 @@ class ExpenseDialog(QDialog):
         # Amount
         self.amount_spin = QDoubleSpinBox()
         self.amount_spin.setMaximum(999999999)
+        self.amount_spin.setDecimals(0)  # IDR has no subunits
         self.amount_spin.setPrefix("IDR ")
         form_layout.addRow(self.tr("Amount:"), self.amount_spin)
         
@@ -100,16 +335,29 @@ class ExpenseDialog(QDialog):
     
     def load_expense_data(self):
         """Load existing expense data"""
-        # Get table name based on database type
-        table_name = "costs" if hasattr(self.db_manager, 'supabase') else "expenses"
-        expense = self.db_manager.execute_query(
-            f"SELECT * FROM {table_name} WHERE id = ?",
+        expense = _as_dicts(self.db_manager.execute_query(
+            f"SELECT {EXPENSE_FORM_COLUMNS[self._table_name]} "
+            f"FROM {self._table_name} WHERE id = ?",
             (self.expense_id,)
-        )
+        ))
         
-        if expense:
-            data = expense[0]
-            # Populate fields based on data
+        if not expense:
+            return
+        
+        # Populate fields - Supabase 'costs' rows use different field names
+        data = expense[0]
+        expense_date = data.get('expense_date', data.get('cost_date'))
+        if expense_date:
+            self.date_edit.setDate(QDate.fromString(str(expense_date)[:10], 'yyyy-MM-dd'))
+        self.category_combo.setCurrentText(data.get('category') or '')
+        self.description_edit.setText(data.get('description') or '')
+        self.supplier_edit.setText(data.get('supplier', data.get('created_by')) or '')
+        self.amount_spin.setValue(float(data.get('amount') or 0))
+        if data.get('payment_method'):
+            self.payment_combo.setCurrentText(data['payment_method'])
+        self.receipt_edit.setText(data.get('receipt_number') or '')
+        self.approved_edit.setText(data.get('approved_by') or '')
+        self.notes_edit.setPlainText(data.get('notes') or '')
     
     def get_expense_data(self):
         """Get expense data from form"""
@@ -119,7 +367,7 @@ class ExpenseDialog(QDialog):
             'category': self.category_combo.currentText(),
             'description': self.description_edit.text(),
             'supplier': self.supplier_edit.text(),
-            'amount': self.amount_spin.value(),
+            'amount': int(round(self.amount_spin.value())),
             'currency': 'IDR',
             'payment_method': self.payment_combo.currentText(),
             'receipt_number': self.receipt_edit.text(),
@@ -140,7 +388,6 @@ class ExpenseDialog(QDialog):
         super().accept()
     
     def tr(self, message):
-        from qgis.PyQt.QtCore import QCoreApplication
         return QCoreApplication.translate('ExpenseDialog', message)
 
 class CostsWidget(QWidget):
@@ -151,7 +398,26 @@ class CostsWidget(QWidget):
         self.iface = iface
         self.db_manager = db_manager
         self.current_site_id = None
+        # Database dialect: Supabase uses the 'costs' table and 'cost_date' column
+        self._is_supabase = hasattr(db_manager, 'supabase')
+        self._table_name = "costs" if self._is_supabase else "expenses"
+        self._date_col = "cost_date" if self._is_supabase else "expense_date"
+        # (site_id, period) -> (breakdown, monthly) query results
+        self._summary_cache = {}
+        # site_id -> category query results
+        self._categories_cache = {}
+        # Debounce filter/period changes so only the final selection queries the DB
+        self._filter_timer = self._debounce_timer(self.filter_expenses)
+        self._period_timer = self._debounce_timer(self.update_summary)
         self.init_ui()
+    
+    def _debounce_timer(self, slot):
+        """Create a single-shot timer calling slot FILTER_DEBOUNCE_MS after its last start"""
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.setInterval(FILTER_DEBOUNCE_MS)
+        timer.timeout.connect(slot)
+        return timer
         
     def init_ui(self):
         layout = QVBoxLayout()
@@ -206,55 +472,50 @@ class CostsWidget(QWidget):
         toolbar.addWidget(QLabel(self.tr("Category:")))
         self.category_filter = QComboBox()
         self.category_filter.addItem(self.tr("All Categories"))
-        self.category_filter.currentTextChanged.connect(self.filter_expenses)
+        self.category_filter.currentTextChanged.connect(lambda: self._filter_timer.start())
         toolbar.addWidget(self.category_filter)
         
         toolbar.addWidget(QLabel(self.tr("Month:")))
         self.month_filter = QComboBox()
         self.month_filter.addItem(self.tr("All"))
         # Add last 12 months
-        current_date = date.today()
-        for i in range(12):
-            month_date = date(current_date.year, current_date.month, 1)
-            month_date = month_date.replace(month=((current_date.month - i - 1) % 12) + 1)
-            if i >= current_date.month:
-                month_date = month_date.replace(year=current_date.year - 1)
-            self.month_filter.addItem(month_date.strftime("%B %Y"), month_date.strftime("%Y-%m"))
-        self.month_filter.currentIndexChanged.connect(self.filter_expenses)
+        for label, key in _last_12_months(date.today().replace(day=1)):
+            self.month_filter.addItem(label, key)
+        self.month_filter.currentIndexChanged.connect(lambda: self._filter_timer.start())
         toolbar.addWidget(self.month_filter)
         
         layout.addWidget(toolbar)
         
         # Expenses table
-        self.expenses_table = QTableWidget()
-        self.expenses_table.setColumnCount(9)
-        self.expenses_table.setHorizontalHeaderLabels([
+        self.expenses_model = CostsTableModel([
             self.tr("ID"), self.tr("Date"), self.tr("Category"), 
             self.tr("Description"), self.tr("Supplier"), self.tr("Amount"),
             self.tr("Payment"), self.tr("Receipt"), self.tr("Approved")
-        ])
+        ], self)
+        self.expenses_table = QTableView()
+        self.expenses_table.setModel(self.expenses_model)
         
         # Hide ID column
         self.expenses_table.hideColumn(0)
         
         # Set column widths
+        # (sized once per refresh instead of live ResizeToContents)
         header = self.expenses_table.horizontalHeader()
-        header.setSectionResizeMode(QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(QHeaderView.Interactive)
         header.setSectionResizeMode(3, QHeaderView.Stretch)  # Description
         
         # Selection
-        self.expenses_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.expenses_table.setSelectionMode(QTableWidget.SingleSelection)
-        self.expenses_table.itemSelectionChanged.connect(self.on_selection_changed)
-        self.expenses_table.cellDoubleClicked.connect(self.edit_expense)
+        self.expenses_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.expenses_table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.expenses_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.expenses_table.selectionModel().selectionChanged.connect(self.on_selection_changed)
+        self.expenses_table.doubleClicked.connect(self.edit_expense)
         
         layout.addWidget(self.expenses_table)
         
         # Total label
         self.total_label = QLabel()
-        font = QFont()
-        font.setBold(True)
-        self.total_label.setFont(font)
+        self.total_label.setFont(_bold_font())
         layout.addWidget(self.total_label)
         
         widget.setLayout(layout)
@@ -275,7 +536,7 @@ class CostsWidget(QWidget):
             self.tr("Last 6 Months"), self.tr("This Year"),
             self.tr("All Time")
         ])
-        self.period_combo.currentIndexChanged.connect(self.update_summary)
+        self.period_combo.currentIndexChanged.connect(lambda: self._period_timer.start())
         controls_layout.addWidget(self.period_combo)
         
         controls_layout.addStretch()
@@ -293,11 +554,11 @@ class CostsWidget(QWidget):
         breakdown_group = QGroupBox(self.tr("Cost Breakdown"))
         breakdown_layout = QVBoxLayout()
         
-        self.breakdown_table = QTableWidget()
-        self.breakdown_table.setColumnCount(3)
-        self.breakdown_table.setHorizontalHeaderLabels([
+        self.breakdown_model = CostsTableModel([
             self.tr("Category"), self.tr("Amount"), self.tr("Percentage")
-        ])
+        ], self)
+        self.breakdown_table = QTableView()
+        self.breakdown_table.setModel(self.breakdown_model)
         header = self.breakdown_table.horizontalHeader()
         header.setSectionResizeMode(0, QHeaderView.Stretch)
         breakdown_layout.addWidget(self.breakdown_table)
@@ -309,11 +570,11 @@ class CostsWidget(QWidget):
         monthly_group = QGroupBox(self.tr("Monthly Summary"))
         monthly_layout = QVBoxLayout()
         
-        self.monthly_table = QTableWidget()
-        self.monthly_table.setColumnCount(3)
-        self.monthly_table.setHorizontalHeaderLabels([
+        self.monthly_model = CostsTableModel([
             self.tr("Month"), self.tr("Expenses"), self.tr("Labor")
-        ])
+        ], self)
+        self.monthly_table = QTableView()
+        self.monthly_table.setModel(self.monthly_model)
         header = self.monthly_table.horizontalHeader()
         header.setSectionResizeMode(QHeaderView.Stretch)
         monthly_layout.addWidget(self.monthly_table)
@@ -332,10 +593,7 @@ class CostsWidget(QWidget):
         
         # Grand total
         self.grand_total_label = QLabel()
-        font = QFont()
-        font.setPointSize(14)
-        font.setBold(True)
-        self.grand_total_label.setFont(font)
+        self.grand_total_label.setFont(_bold_large_font())
         self.grand_total_label.setAlignment(Qt.AlignRight)
         layout.addWidget(self.grand_total_label)
         
@@ -347,16 +605,12 @@ class CostsWidget(QWidget):
         self.site_combo.clear()
         self.site_combo.addItem(self.tr("Select Site..."), None)
         
-        sites = self.db_manager.execute_query(
+        sites = _as_dicts(self.db_manager.execute_query(
             "SELECT id, site_name FROM sites ORDER BY site_name"
-        )
+        ))
         
-        if sites:
-            for site in sites:
-                if isinstance(site, dict):
-                    self.site_combo.addItem(site['site_name'], site['id'])
-                else:
-                    self.site_combo.addItem(site[1], site[0])
+        for site in sites:
+            self.site_combo.addItem(site['site_name'], site['id'])
     
     def on_site_changed(self, index):
         """Handle site selection change"""
@@ -370,33 +624,30 @@ class CostsWidget(QWidget):
         if not self.current_site_id:
             return
         
-        # Get table name based on database type
-        table_name = "costs" if hasattr(self.db_manager, 'supabase') else "expenses"
-        
-        categories = self.db_manager.execute_query(
-            f"SELECT DISTINCT category FROM {table_name} WHERE site_id = ? ORDER BY category",
-            (self.current_site_id,)
-        )
+        categories = self._categories_cache.get(self.current_site_id)
+        if categories is None:
+            categories = _as_dicts(self.db_manager.execute_query(
+                f"SELECT DISTINCT category FROM {self._table_name} WHERE site_id = ? ORDER BY category",
+                (self.current_site_id,)
+            ))
+            self._cache_put(self._categories_cache, self.current_site_id, categories)
         
         self.category_filter.clear()
         self.category_filter.addItem(self.tr("All Categories"))
         
-        if categories:
-            for cat in categories:
-                if isinstance(cat, dict):
-                    self.category_filter.addItem(cat['category'])
-                else:
-                    self.category_filter.addItem(cat[0])
+        for cat in categories:
+            self.category_filter.addItem(cat['category'])
     
     def refresh_expenses(self):
         """Refresh expenses table"""
         if not self.current_site_id:
-            self.expenses_table.setRowCount(0)
+            self.expenses_model.set_rows([])
+            self.on_selection_changed()
             self.total_label.setText("")
             return
         
         # Build query - check if using costs or expenses table
-        if hasattr(self.db_manager, 'supabase'):
+        if self._is_supabase:
             # Supabase uses 'costs' table
             query = """
                 SELECT id, cost_date as expense_date, category, description, 
@@ -425,7 +676,7 @@ class CostsWidget(QWidget):
         month_data = self.month_filter.currentData()
         if month_data and self.month_filter.currentIndex() > 0:
             # For Supabase, we need to filter by date range
-            query += " AND expense_date >= ? AND expense_date < ?"
+            query += f" AND {self._date_col} >= ? AND {self._date_col} < ?"
             # Create first and last day of month
             year, month = month_data.split('-')
             first_day = f"{year}-{month}-01"
@@ -438,195 +689,172 @@ class CostsWidget(QWidget):
         
         query += " ORDER BY expense_date DESC"
         
-        print(f"DEBUG Costs: Query: {query}")
-        print(f"DEBUG Costs: Params: {params}")
-        expenses = self.db_manager.execute_query(query, params)
-        print(f"DEBUG Costs: Found {len(expenses) if expenses else 0} expenses")
+        logger.debug("Costs query: %s params: %s", query, params)
+        expenses = _as_dicts(self.db_manager.execute_query(query, params))
+        logger.debug("Costs: found %d expenses", len(expenses))
         
-        self.expenses_table.setRowCount(0)
+        rows = []
         total = 0
         
-        if expenses:
-            for expense in expenses:
-                row = self.expenses_table.rowCount()
-                self.expenses_table.insertRow(row)
-                
-                if isinstance(expense, dict):
-                    # Handle different field names between costs (Supabase) and expenses (SQLite)
-                    values = [
-                        str(expense['id']),
-                        expense.get('expense_date', expense.get('cost_date', '')),
-                        expense['category'],
-                        expense['description'],
-                        expense.get('supplier', expense.get('created_by', '')),
-                        f"IDR {expense['amount']:,.0f}",
-                        expense.get('payment_method', expense.get('currency', 'IDR')),
-                        expense.get('receipt_number', expense.get('notes', '')),
-                        expense.get('approved_by', expense.get('created_by', ''))
-                    ]
-                    total += expense['amount']
-                else:
-                    values = [str(v) if v else '' for v in expense]
-                    if len(expense) > 5:
-                        values[5] = f"IDR {expense[5]:,.0f}"
-                        total += expense[5]
-                
-                for col, value in enumerate(values):
-                    self.expenses_table.setItem(row, col, QTableWidgetItem(value))
-        
-        self.total_label.setText(self.tr(f"Total: IDR {total:,.0f}"))
+        for expense in expenses:
+            amount = int(round(expense['amount'] or 0))
+            # Handle different field names between costs (Supabase) and expenses (SQLite)
+            rows.append((
+                str(expense['id']),
+                expense.get('expense_date', expense.get('cost_date', '')),
+                expense['category'],
+                expense['description'],
+                expense.get('supplier', expense.get('created_by', '')),
+                _fmt_idr(amount),
+                expense.get('payment_method', expense.get('currency', 'IDR')),
+                expense.get('receipt_number', expense.get('notes', '')),
+                expense.get('approved_by', expense.get('created_by', ''))
+            ))
+            total += amount
+        
+        # Single repaint for the whole refresh
+        self.expenses_table.setUpdatesEnabled(False)
+        try:
+            self.expenses_model.set_rows(rows)
+            # Rows are reused in place, so a selection would now point at another expense
+            self.expenses_table.clearSelection()
+            self.expenses_table.resizeColumnsToContents()
+        finally:
+            self.expenses_table.setUpdatesEnabled(True)
+        self.on_selection_changed()
+        self.total_label.setText(self.tr("Total: {0}").format(_fmt_idr(total)))
     
     def filter_expenses(self):
         """Filter expenses based on selections"""
         self.refresh_expenses()
     
-    def update_summary(self):
-        """Update summary tab"""
-        if not self.current_site_id:
-            return
-        
-        # Get period
-        period = self.period_combo.currentIndex()
+    def _query_summary(self, period):
+        """Query category breakdown and monthly totals for the current site"""
         date_filter = ""
         
         if period == 0:  # This month
-            if hasattr(self.db_manager, 'supabase'):
+            if self._is_supabase:
                 date_filter = f"AND cost_date >= date_trunc('month', CURRENT_DATE)"
             else:
                 date_filter = f"AND expense_date >= date('now', 'start of month')"
         elif period == 1:  # Last 3 months
-            if hasattr(self.db_manager, 'supabase'):
+            if self._is_supabase:
                 date_filter = f"AND cost_date >= CURRENT_DATE - INTERVAL '3 months'"
             else:
                 date_filter = f"AND expense_date >= date('now', '-3 months')"
         elif period == 2:  # Last 6 months
-            if hasattr(self.db_manager, 'supabase'):
+            if self._is_supabase:
                 date_filter = f"AND cost_date >= CURRENT_DATE - INTERVAL '6 months'"
             else:
                 date_filter = f"AND expense_date >= date('now', '-6 months')"
         elif period == 3:  # This year
-            if hasattr(self.db_manager, 'supabase'):
+            if self._is_supabase:
                 date_filter = f"AND cost_date >= date_trunc('year', CURRENT_DATE)"
             else:
                 date_filter = f"AND expense_date >= date('now', 'start of year')"
         # period == 4 is All Time, no filter
         
         # Get breakdown by category
-        # Get table name based on database type
-        table_name = "costs" if hasattr(self.db_manager, 'supabase') else "expenses"
-        date_col = "cost_date" if hasattr(self.db_manager, 'supabase') else "expense_date"
-        
-        # Adjust date filter for correct column
-        if date_filter and hasattr(self.db_manager, 'supabase'):
-            date_filter = date_filter.replace('expense_date', 'cost_date')
-        
-        breakdown = self.db_manager.execute_query(f"""
-            SELECT category, SUM(amount) as total
-            FROM {table_name}
+        breakdown = _as_dicts(self.db_manager.execute_query(f"""
+            SELECT category, SUM(amount) as total,
+                   SUM(SUM(amount)) OVER () as grand
+            FROM {self._table_name}
             WHERE site_id = ? {date_filter}
             GROUP BY category
             ORDER BY total DESC
-        """, (self.current_site_id,))
-        
-        self.breakdown_table.setRowCount(0)
-        grand_total = 0
-        
-        if breakdown:
-            for item in breakdown:
-                if isinstance(item, dict):
-                    cat_total = item.get('total', 0)
-                    grand_total += cat_total
-                else:
-                    cat_total = item[1] if len(item) > 1 else 0
-                    grand_total += cat_total
-            
-            # Add rows with percentages
-            for item in breakdown:
-                row = self.breakdown_table.rowCount()
-                self.breakdown_table.insertRow(row)
-                
-                if isinstance(item, dict):
-                    category = item['category']
-                    amount = item['total']
-                else:
-                    category = item[0]
-                    amount = item[1]
-                
-                percentage = (amount / grand_total * 100) if grand_total > 0 else 0
-                
-                self.breakdown_table.setItem(row, 0, QTableWidgetItem(category))
-                self.breakdown_table.setItem(row, 1, QTableWidgetItem(f"IDR {amount:,.0f}"))
-                self.breakdown_table.setItem(row, 2, QTableWidgetItem(f"{percentage:.1f}%"))
-        
-        # Get monthly summary
-        # For Supabase, we need to get costs and aggregate in Python
-        costs_query = f"SELECT expense_date, amount FROM costs WHERE site_id = ? {date_filter}"
-        all_costs = self.db_manager.execute_query(costs_query, (self.current_site_id,))
-        
-        # Group by month in Python
-        monthly_data = {}
-        if all_costs:
-            for cost in all_costs:
-                if isinstance(cost, dict):
-                    date_str = cost.get('expense_date')
-                    amount = cost.get('amount', 0)
-                else:
-                    date_str = cost[0]
-                    amount = cost[1] or 0
-                
-                if date_str:
-                    # Extract year-month
-                    try:
-                        date_obj = datetime.strptime(date_str[:10], '%Y-%m-%d')
-                        month_key = date_obj.strftime('%Y-%m')
-                        
-                        if month_key not in monthly_data:
-                            monthly_data[month_key] = {'expenses': 0, 'labor': 0}
-                        
-                        monthly_data[month_key]['expenses'] += amount
-                    except:
-                        pass
-        
-        # Convert to list format expected by the display code
-        monthly = []
-        for month, data in sorted(monthly_data.items(), reverse=True)[:12]:
-            monthly.append({
-                'month': month,
-                'expenses': data['expenses'],
-                'labor': 0  # Labor calculation would need separate query
-            })
-        
-        self.monthly_table.setRowCount(0)
+        """, (self.current_site_id,)))
+        
+        # Get monthly summary aggregated by the database
+        if self._is_supabase:
+            monthly_query = f"""
+                SELECT to_char(cost_date, 'YYYY-MM') AS month,
+                       SUM(amount) AS expenses, 0 AS labor
+                FROM costs
+                WHERE site_id = ? AND cost_date IS NOT NULL {date_filter}
+                GROUP BY month
+                ORDER BY month DESC
+                LIMIT 12
+            """
+        else:
+            monthly_query = f"""
+                SELECT strftime('%Y-%m', expense_date) AS month,
+                       SUM(amount) AS expenses, 0 AS labor
+                FROM expenses
+                WHERE site_id = ? {date_filter}
+                GROUP BY month
+                HAVING month IS NOT NULL
+                ORDER BY month DESC
+                LIMIT 12
+            """
+        monthly = _as_dicts(self.db_manager.execute_query(monthly_query, (self.current_site_id,)))
+        
+        return breakdown, monthly
+    
+    def update_summary(self):
+        """Update summary tab"""
+        if not self.current_site_id:
+            return
+        
+        # Get period
+        period = self.period_combo.currentIndex()
+        
+        # Reuse results of a previously viewed site/period
+        key = (self.current_site_id, period)
+        cached = self._summary_cache.get(key)
+        if cached is None:
+            cached = self._query_summary(period)
+            self._cache_put(self._summary_cache, key, cached)
+        breakdown, monthly = cached
+        
+        breakdown_rows = []
+        # Every row carries the window total computed by the database
+        grand_total = int(round(breakdown[0]['grand'] or 0)) if breakdown else 0
+        scale = 100.0 / grand_total if grand_total > 0 else 0.0
+        
+        # Add rows with percentages
+        for item in breakdown:
+            amount = int(round(item['total'] or 0))
+            breakdown_rows.append((
+                item['category'],
+                _fmt_idr(amount),
+                f"{amount * scale:.1f}%"
+            ))
+        
+        self.breakdown_model.set_rows(breakdown_rows)
+        
+        monthly_rows = []
         total_labor = 0
         
-        if monthly:
-            for item in monthly:
-                row = self.monthly_table.rowCount()
-                self.monthly_table.insertRow(row)
-                
-                if isinstance(item, dict):
-                    month = datetime.strptime(item['month'], '%Y-%m').strftime('%B %Y')
-                    expenses = item['expenses'] or 0
-                    labor = item['labor'] or 0
-                else:
-                    month = datetime.strptime(item[0], '%Y-%m').strftime('%B %Y')
-                    expenses = item[1] or 0
-                    labor = item[2] or 0
-                
-                total_labor += labor
-                
-                self.monthly_table.setItem(row, 0, QTableWidgetItem(month))
-                self.monthly_table.setItem(row, 1, QTableWidgetItem(f"IDR {expenses:,.0f}"))
-                self.monthly_table.setItem(row, 2, QTableWidgetItem(f"IDR {labor:,.0f}"))
+        for item in monthly:
+            month = datetime.strptime(item['month'], '%Y-%m').strftime('%B %Y')
+            expenses = int(round(item['expenses'] or 0))
+            labor = int(round(item['labor'] or 0))
+            
+            total_labor += labor
+            
+            monthly_rows.append((month, _fmt_idr(expenses), _fmt_idr(labor)))
+        
+        self.monthly_model.set_rows(monthly_rows)
         
         # Update grand total
         self.grand_total_label.setText(
-            self.tr(f"Total Project Cost: IDR {(grand_total + total_labor):,.0f}")
+            self.tr("Total Project Cost: {0}").format(_fmt_idr(grand_total + total_labor))
         )
     
+    def _cache_put(self, cache, key, value):
+        """Store a value in a small FIFO cache"""
+        if len(cache) >= SUMMARY_CACHE_SIZE:
+            cache.pop(next(iter(cache)))
+        cache[key] = value
+    
+    def invalidate_caches(self):
+        """Drop cached summary and category results after data changes"""
+        self._summary_cache.clear()
+        self._categories_cache.clear()
+    
     def on_selection_changed(self):
         """Handle selection change"""
-        has_selection = len(self.expenses_table.selectedItems()) > 0
+        has_selection = self.expenses_table.selectionModel().hasSelection()
         self.edit_expense_action.setEnabled(has_selection)
         self.delete_expense_action.setEnabled(has_selection)
     
@@ -644,13 +872,11 @@ class CostsWidget(QWidget):
         if dlg.exec_():
             data = dlg.get_expense_data()
             
-            columns = ', '.join(data.keys())
-            placeholders = ', '.join(['?' for _ in data])
-            
             if self.db_manager.execute_update(
-                f"INSERT INTO expenses ({columns}) VALUES ({placeholders})",
-                list(data.values())
+                INSERT_EXPENSE_SQL,
+                [data[c] for c in EXPENSE_COLS]
             ):
+                self.invalidate_caches()
                 self.refresh_expenses()
                 self.update_summary()
                 QMessageBox.information(
@@ -659,13 +885,35 @@ class CostsWidget(QWidget):
                     self.tr("Expense added successfully")
                 )
     
+    def add_expenses_bulk(self, rows):
+        """Insert many expenses (dicts keyed by EXPENSE_COLS) in one batch"""
+        if not rows:
+            return False
+        
+        result = self.db_manager.execute_many(
+            INSERT_EXPENSE_SQL,
+            [tuple(row.get(c) for c in EXPENSE_COLS) for row in rows]
+        )
+        if result:
+            self.invalidate_caches()
+            self.refresh_expenses()
+            self.update_summary()
+        return result
+    
+    def selected_expense(self):
+        """Return display values of the selected expense row, or None"""
+        rows = self.expenses_table.selectionModel().selectedRows()
+        if not rows:
+            return None
+        return self.expenses_model.row_values(rows[0].row())
+    
     def edit_expense(self):
         """Edit selected expense"""
-        if not self.expenses_table.selectedItems():
+        values = self.selected_expense()
+        if not values:
             return
         
-        row = self.expenses_table.currentRow()
-        expense_id = int(self.expenses_table.item(row, 0).text())
+        expense_id = int(values[0])
         
         dlg = ExpenseDialog(
             self.db_manager,
@@ -676,29 +924,29 @@ class CostsWidget(QWidget):
         
         if dlg.exec_():
             data = dlg.get_expense_data()
-            set_clause = ', '.join([f"{k} = ?" for k in data.keys()])
-            values = list(data.values()) + [expense_id]
+            values = [data[c] for c in EXPENSE_COLS] + [expense_id]
             
             if self.db_manager.execute_update(
-                f"UPDATE expenses SET {set_clause} WHERE id = ?",
+                UPDATE_EXPENSE_SQL,
                 values
             ):
+                self.invalidate_caches()
                 self.refresh_expenses()
                 self.update_summary()
     
     def delete_expense(self):
         """Delete selected expense"""
-        if not self.expenses_table.selectedItems():
+        values = self.selected_expense()
+        if not values:
             return
         
-        row = self.expenses_table.currentRow()
-        expense_id = int(self.expenses_table.item(row, 0).text())
-        description = self.expenses_table.item(row, 3).text()
+        expense_id = int(values[0])
+        description = values[3]
         
         reply = QMessageBox.question(
             self,
             self.tr("Confirm Delete"),
-            self.tr(f"Delete expense: {description}?"),
+            self.tr("Delete expense: {0}?").format(description),
             QMessageBox.Yes | QMessageBox.No
         )
         
@@ -707,6 +955,7 @@ class CostsWidget(QWidget):
                 "DELETE FROM expenses WHERE id = ?",
                 (expense_id,)
             ):
+                self.invalidate_caches()
                 self.refresh_expenses()
                 self.update_summary()
     
@@ -716,7 +965,7 @@ class CostsWidget(QWidget):
             return
         
         # Get file path
-        from qgis.PyQt.QtWidgets import QFileDialog
+        from qgis.PyQt.QtWidgets import QFileDialog, QProgressDialog
         file_path, _ = QFileDialog.getSaveFileName(
             self,
             self.tr("Export Report"),
@@ -725,61 +974,41 @@ class CostsWidget(QWidget):
         )
         
         if file_path:
-            try:
-                import csv
-                
-                # Get all data
-                expenses = self.db_manager.execute_query(
-                    """SELECT expense_date, category, description, supplier,
-                              amount, payment_method, receipt_number, approved_by, notes
-                       FROM expenses
-                       WHERE site_id = ?
-                       ORDER BY expense_date DESC""",
-                    (self.current_site_id,)
-                )
-                
-                with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f)
-                    
-                    # Header
-                    writer.writerow([
-                        'Date', 'Category', 'Description', 'Supplier',
-                        'Amount (IDR)', 'Payment Method', 'Receipt #',
-                        'Approved By', 'Notes'
-                    ])
-                    
-                    # Data
-                    for expense in expenses:
-                        if isinstance(expense, dict):
-                            row = [
-                                expense['expense_date'],
-                                expense['category'],
-                                expense['description'],
-                                expense['supplier'] or '',
-                                expense['amount'],
-                                expense['payment_method'],
-                                expense['receipt_number'] or '',
-                                expense['approved_by'] or '',
-                                expense['notes'] or ''
-                            ]
-                        else:
-                            row = list(expense)
-                        
-                        writer.writerow(row)
-                
-                QMessageBox.information(
-                    self,
-                    self.tr("Success"),
-                    self.tr("Report exported successfully")
-                )
-                
-            except Exception as e:
-                QMessageBox.critical(
-                    self,
-                    self.tr("Error"),
-                    self.tr(f"Export failed: {str(e)}")
-                )
+            progress = QProgressDialog(
+                self.tr("Exporting report..."), self.tr("Cancel"), 0, 0, self
+            )
+            progress.setWindowModality(Qt.WindowModal)
+            
+            # Write the CSV on a worker thread so the UI stays responsive
+            self.export_worker = ExportWorker(self.db_manager, self.current_site_id, file_path,
+                                              self._table_name, self._date_col)
+            self.export_worker.export_progress.connect(
+                lambda count: progress.setLabelText(self.tr("Exported {0} expenses...").format(count))
+            )
+            self.export_worker.export_finished.connect(
+                lambda success, error: self.on_export_finished(progress, success, error)
+            )
+            progress.canceled.connect(self.export_worker.requestInterruption)
+            progress.show()
+            self.export_worker.start()
+    
+    def on_export_finished(self, progress, success, error):
+        """Handle export worker completion"""
+        progress.close()
+        
+        if success:
+            QMessageBox.information(
+                self,
+                self.tr("Success"),
+                self.tr("Report exported successfully")
+            )
+        elif error:
+            # An empty error means the export was cancelled
+            QMessageBox.critical(
+                self,
+                self.tr("Error"),
+                self.tr("Export failed: {0}").format(error)
+            )
     
     def tr(self, message):
-        from qgis.PyQt.QtCore import QCoreApplication
         return QCoreApplication.translate('CostsWidget', message)
\ No newline at end of file
@@ -4,10 +4,31 @@ Database creation/opening dialog
 """
 
 import os
+from functools import lru_cache
 from qgis.PyQt.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, 
                                 QPushButton, QLabel, QLineEdit, 
                                 QFileDialog, QRadioButton, QButtonGroup)
-from qgis.PyQt.QtCore import Qt
+from qgis.PyQt.QtCore import Qt, QTimer, pyqtSlot
+
+# Idle time after the last keystroke before the path is checked on disk
+PATH_CHECK_DELAY_MS = 200
+
+# Skip per-entry icon lookups and symlink resolution when browsing (slow on network shares)
+BROWSE_OPTIONS = (QFileDialog.DontUseCustomDirectoryIcons | QFileDialog.DontResolveSymlinks |
+                  QFileDialog.HideNameFilterDetails)
+
+# Database file extensions, and the single name filter pattern matching them
+DB_EXTENSIONS = ('.sqlite', '.db')
+DB_NAME_PATTERNS = ' '.join('*' + ext for ext in DB_EXTENSIONS)
+
+@lru_cache(maxsize=32)
+def _file_exists(path):
+    """Cached existence check; cleared whenever the path box changes"""
+    try:
+        os.stat(path)
+        return True
+    except OSError:
+        return False
 
 class DatabaseDialog(QDialog):
     """Dialog for creating or opening a database"""
@@ -23,6 +44,11 @@ class DatabaseDialog(QDialog):
         
     def init_ui(self):
         """Initialize the user interface"""
+        # Translated once for every browse
+        self._db_filter = self.tr("SpatiaLite Database ({0})").format(DB_NAME_PATTERNS)
+        self._save_caption = self.tr("Create Database")
+        self._open_caption = self.tr("Open Database")
+        
         layout = QVBoxLayout()
         
         # Radio buttons for new/existing
@@ -44,6 +70,14 @@ class DatabaseDialog(QDialog):
         self.path_edit = QLineEdit()
         file_layout.addWidget(self.path_edit)
         
+        # Validate the path once typing pauses instead of on every keystroke
+        self._path_timer = QTimer(self)
+        self._path_timer.setSingleShot(True)
+        self._path_timer.setInterval(PATH_CHECK_DELAY_MS)
+        self._path_timer.timeout.connect(self._validate_path)
+        self.path_edit.textChanged.connect(lambda: _file_exists.cache_clear())
+        self.path_edit.textChanged.connect(lambda: self._path_timer.start())
+        
         self.browse_button = QPushButton(self.tr("Browse..."))
         self.browse_button.clicked.connect(self.browse_file)
         file_layout.addWidget(self.browse_button)
@@ -66,31 +100,33 @@ class DatabaseDialog(QDialog):
         self.setLayout(layout)
         
         # Connect radio button changes
-        self.radio_group.buttonClicked.connect(self.on_radio_changed)
+        self.new_radio.toggled.connect(self.on_radio_changed)
+        
+        self._validate_path()
         
-    def on_radio_changed(self):
+    @pyqtSlot(bool)
+    def on_radio_changed(self, is_new):
         """Handle radio button changes"""
-        self.is_new = self.new_radio.isChecked()
+        self.is_new = is_new
+        self._validate_path()
+    
+    @pyqtSlot()
+    def _validate_path(self):
+        """Enable OK only for a usable path"""
+        path = self.path_edit.text()
+        self.ok_button.setEnabled(bool(path) and (self.is_new or _file_exists(path)))
         
+    @pyqtSlot()
     def browse_file(self):
         """Browse for database file"""
-        if self.new_radio.isChecked():
-            # Save dialog for new database
-            file_path, _ = QFileDialog.getSaveFileName(
-                self,
-                self.tr("Create Database"),
-                "",
-                self.tr("SpatiaLite Database (*.sqlite *.db)")
-            )
-        else:
-            # Open dialog for existing database
-            file_path, _ = QFileDialog.getOpenFileName(
-                self,
-                self.tr("Open Database"),
-                "",
-                self.tr("SpatiaLite Database (*.sqlite *.db)")
-            )
-        
+        # Save dialog for a new database, open dialog for an existing one
+        dialog = QFileDialog(self, self._save_caption if self.is_new else self._open_caption)
+        dialog.setAcceptMode(QFileDialog.AcceptSave if self.is_new else QFileDialog.AcceptOpen)
+        dialog.setFileMode(QFileDialog.AnyFile if self.is_new else QFileDialog.ExistingFile)
+        dialog.setNameFilters([self._db_filter])
+        dialog.setOptions(BROWSE_OPTIONS)
+        
+        file_path = dialog.selectedFiles()[0] if dialog.exec_() else ""
         if file_path:
             self.path_edit.setText(file_path)
             self.db_path = file_path
@@ -101,7 +137,7 @@ class DatabaseDialog(QDialog):
     
     def is_new_database(self):
         """Check if creating new database"""
-        return self.new_radio.isChecked()
+        return self.is_new
     
     def accept(self):
         """Validate and accept"""
@@ -110,7 +146,7 @@ class DatabaseDialog(QDialog):
         if not self.db_path:
             return
         
-        if self.existing_radio.isChecked() and not os.path.exists(self.db_path):
+        if not self.is_new and not _file_exists(self.db_path):
             return
         
         super().accept()
@@ -1,19 +1,27 @@
 # -*- coding: utf-8 -*-
 """Dive log management widget"""
 
-from qgis.PyQt.QtCore import Qt, QDate, QTime, pyqtSignal, QSize
+from qgis.PyQt.QtCore import (Qt, QDate, QTime, QThread, pyqtSignal, QSize,
+                              QAbstractListModel, QModelIndex, QUrl)
 from qgis.core import QgsMessageLog, Qgis
 from qgis.PyQt.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                                 QTableWidget, QTableWidgetItem, QToolBar,
                                 QLineEdit, QLabel, QMessageBox, QHeaderView,
                                 QFormLayout, QDialog, QDialogButtonBox,
-                                QTextEdit, QDateEdit, QTimeEdit, QSpinBox, 
+                                QPlainTextEdit, QDateEdit, QTimeEdit, QSpinBox, 
                                 QDoubleSpinBox, QComboBox, QListWidget,
-                                QListWidgetItem, QGroupBox, QCheckBox, 
-                                QTabWidget, QGridLayout)
-from qgis.PyQt.QtGui import QIcon, QPixmap, QDragEnterEvent, QDropEvent
+                                QListView, QGroupBox, QCheckBox, 
+                                QTabWidget, QGridLayout, QApplication, QStyle,
+                                QProgressDialog)
+from qgis.PyQt.QtGui import (QIcon, QImage, QImageReader, QPixmap, QPixmapCache,
+                             QDragEnterEvent, QDropEvent, QDesktopServices)
 from datetime import datetime, date
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
+import logging
 import os
+import re
 import shutil
 import sys
 
@@ -23,10 +31,298 @@ if plugin_dir not in sys.path:
     sys.path.insert(0, plugin_dir)
 
 from ui.media_list_widget import MediaListWidget
+from ui.workers_widget import get_active_workers
 
+logger = logging.getLogger(__name__)
 
-class MediaDropListWidget(QListWidget):
-    """Custom QListWidget that accepts drag and drop of image files"""
+# Room for decoded media previews shared by all dive log dialogs (in KB)
+PREVIEW_CACHE_KB = 50 * 1024
+
+# Dive log fields loaded into the dialog, after the id and site_id columns
+DIVE_LOG_FIELDS = ('dive_number', 'dive_date', 'dive_start', 'dive_end', 'max_depth',
+                   'avg_depth', 'water_temp', 'visibility', 'current_strength',
+                   'weather_conditions', 'dive_objectives', 'work_completed',
+                   'findings_summary', 'equipment_used', 'notes')
+# Columns saved from the dialog, in the order of get_dive_data()
+DIVE_LOG_COLUMNS = ('site_id',) + DIVE_LOG_FIELDS
+INSERT_DIVE_LOG_SQL = (f"INSERT INTO dive_logs ({', '.join(DIVE_LOG_COLUMNS)}) "
+                       f"VALUES ({', '.join(['?'] * len(DIVE_LOG_COLUMNS))})")
+UPDATE_DIVE_LOG_SQL = (f"UPDATE dive_logs SET {', '.join(f'{column} = ?' for column in DIVE_LOG_COLUMNS)} "
+                       f"WHERE id = ?")
+
+INSERT_DIVE_TEAM_SQL = """INSERT INTO dive_team (dive_id, worker_id, role)
+                          VALUES (?, ?, ?)"""
+# Team rows per multi-row INSERT, keeping under SQLite's 999 bound parameters
+DIVE_TEAM_ROWS_PER_INSERT = 999 // 3
+
+# Site statistics added to each row of the dive list query (window aggregates over all rows)
+DIVE_STATS_COLUMNS = """,
+                       COUNT(*) OVER () as total_dives,
+                       SUM(CAST((julianday(d.dive_end) - julianday(d.dive_start)) * 24 AS REAL)) OVER () as total_hours,
+                       AVG(d.max_depth) OVER () as avg_depth_all,
+                       MAX(d.max_depth) OVER () as max_depth_all"""
+
+# Numeric parts of a dive number, and its last numeric part
+DIVE_NUMBER_RE = re.compile(r'\d+')
+LAST_DIVE_NUMBER_RE = re.compile(r'\d+(?!.*\d)')
+
+
+@lru_cache(maxsize=None)
+def thumbnail_path(image_path):
+    """Return the path of an image's thumbnail, kept in a thumbnails folder next to its folder"""
+    base_dir = os.path.dirname(os.path.dirname(image_path))
+    filename = os.path.basename(image_path)
+    return os.path.join(base_dir, 'thumbnails', f'thumb_{filename}')
+
+
+def prepare_media(file_path, dest_folder, timestamp, index):
+    """Return the timestamped file name and destination path for copying a media file"""
+    filename = os.path.basename(file_path)
+    # The index keeps files of the same batch apart, even with equal names
+    new_filename = f"{timestamp}_{index:03d}_{filename}"
+    return filename, new_filename, os.path.join(dest_folder, new_filename)
+
+
+@lru_cache(maxsize=None)
+def dive_team_insert_sql(row_count):
+    """Return the INSERT statement for row_count team members
+    
+    The same text is returned for the same team size, so the sqlite3 module
+    reuses the statement it already prepared instead of parsing it again.
+    """
+    placeholders = ', '.join(['(?, ?, ?)'] * row_count)
+    return f"INSERT INTO dive_team (dive_id, worker_id, role) VALUES {placeholders}"
+
+
+def insert_dive_team(db_manager, dive_id, team_members):
+    """Insert the team members of a dive with as few statements as possible"""
+    rows = [(dive_id, member['worker_id'], member['role']) for member in team_members]
+    if not rows:
+        return
+    if hasattr(db_manager, 'supabase'):
+        # Supabase sends all the rows in one bulk request
+        db_manager.execute_many(INSERT_DIVE_TEAM_SQL, rows)
+        return
+    for start in range(0, len(rows), DIVE_TEAM_ROWS_PER_INSERT):
+        chunk = rows[start:start + DIVE_TEAM_ROWS_PER_INSERT]
+        db_manager.execute_update(
+            dive_team_insert_sql(len(chunk)),
+            list(chain.from_iterable(chunk))
+        )
+
+
+def update_dive_team(db_manager, dive_id, team_members):
+    """Bring the saved team of a dive in line with team_members, writing only the changes"""
+    if hasattr(db_manager, 'supabase'):
+        # Supabase only supports deleting the whole team, then adding it again
+        db_manager.execute_update(
+            "DELETE FROM dive_team WHERE dive_id = ?",
+            (dive_id,)
+        )
+        insert_dive_team(db_manager, dive_id, team_members)
+        return
+    
+    saved = db_manager.execute_query(
+        "SELECT worker_id, role FROM dive_team WHERE dive_id = ?",
+        (dive_id,)
+    ) or []
+    existing = {(row['worker_id'], row['role']) for row in saved}
+    wanted = {(member['worker_id'], member['role']) for member in team_members}
+    
+    # A worker is only once in a team, so a changed role is a removal plus an addition
+    removed_workers = [worker_id for worker_id, role in existing - wanted]
+    if removed_workers:
+        placeholders = ', '.join(['?'] * len(removed_workers))
+        db_manager.execute_update(
+            f"DELETE FROM dive_team WHERE dive_id = ? AND worker_id IN ({placeholders})",
+            [dive_id] + removed_workers
+        )
+    insert_dive_team(db_manager, dive_id, [
+        member for member in team_members
+        if (member['worker_id'], member['role']) not in existing
+    ])
+
+
+def minutes_between(start, end):
+    """Return the whole minutes from a start to an end time (HH:MM[:SS]), None if unknown"""
+    if not start or not end:
+        return None
+    times = []
+    for value in (str(start), str(end)):
+        try:
+            times.append(datetime.strptime(value, '%H:%M:%S'))
+        except ValueError:
+            try:
+                times.append(datetime.strptime(value, '%H:%M'))
+            except ValueError:
+                return None
+    return int((times[1] - times[0]).total_seconds() / 60)
+
+
+def read_scaled_image(path, size):
+    """Read an image already scaled to fit size x size, so large photos are never fully decoded"""
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    scaled_size = reader.size()
+    if scaled_size.isValid():
+        scaled_size.scale(size, size, Qt.KeepAspectRatio)
+        reader.setScaledSize(scaled_size)
+    return reader.read()
+
+
+class DiveMediaModel(QAbstractListModel):
+    """List model of the media attached to a dive log
+    
+    Rows are dicts with the display 'name', the image 'path' to preview (or
+    None) and, for files added in the dialog but not saved yet, their 'new'
+    file info. Thumbnails are only decoded when the view asks for a visible
+    row, and are kept in QPixmapCache.
+    """
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._media = []
+    
+    def set_media(self, media):
+        """Replace all rows"""
+        self.beginResetModel()
+        self._media = list(media)
+        self.endResetModel()
+    
+    def add_media(self, media):
+        """Append a row"""
+        row = len(self._media)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._media.append(media)
+        self.endInsertRows()
+    
+    def set_preview(self, file_path, preview_path):
+        """Set the image previewed for the new media copied to file_path"""
+        for row, media in enumerate(self._media):
+            if media.get('new') and media['new']['file_path'] == file_path:
+                media['path'] = preview_path
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [Qt.DecorationRole])
+                return
+    
+    def new_media(self):
+        """Return the file info of media added since the dialog opened"""
+        return [media['new'] for media in self._media if media.get('new')]
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._media)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        media = self._media[index.row()]
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return media['name']
+        if role == Qt.DecorationRole:
+            if media.get('path'):
+                return self._icon(media['path'])
+            if media.get('new'):
+                # Placeholder until the thumbnail of a new image is ready
+                return QApplication.style().standardIcon(QStyle.SP_FileIcon)
+        return None
+    
+    def _icon(self, path):
+        """Return the 64x64 preview icon of an image, decoding it on first use"""
+        key = f"dive_media:{path}"
+        pixmap = QPixmapCache.find(key)
+        if pixmap is None:
+            pixmap = QPixmap.fromImage(read_scaled_image(path, 64))
+            QPixmapCache.insert(key, pixmap)
+        return None if pixmap.isNull() else QIcon(pixmap)
+
+
+class ThumbnailWorker(QThread):
+    """Worker thread creating thumbnails for copied media files"""
+    
+    thumbnail_ready = pyqtSignal(str, str)  # image path, preview path
+    
+    def __init__(self, images):
+        super().__init__()
+        self.images = images  # list of (image path, thumbnail path)
+    
+    def run(self):
+        """Create thumbnails"""
+        for image_path, thumb_path in self.images:
+            if self.create_thumbnail(image_path, thumb_path):
+                self.thumbnail_ready.emit(image_path, thumb_path)
+            else:
+                self.thumbnail_ready.emit(image_path, image_path)
+    
+    @staticmethod
+    def create_thumbnail(image_path, thumb_path):
+        """Create thumbnail for image, return True on success"""
+        try:
+            from PIL import Image
+            
+            with Image.open(image_path) as img:
+                if img.format == 'JPEG':
+                    # Let the JPEG decoder downscale before any pixels are read
+                    img.draft('RGB', (300, 300))
+                img.thumbnail((150, 150), Image.Resampling.LANCZOS)
+                img.save(thumb_path)
+            return True
+                
+        except ImportError:
+            # PIL not available, try Qt (QImage - QPixmap is GUI thread only)
+            try:
+                image = read_scaled_image(image_path, 150)
+                if not image.isNull():
+                    return image.save(thumb_path)
+            except:
+                pass
+        except Exception:
+            pass
+        return False
+
+
+class BatchReportWorker(QThread):
+    """Worker thread writing the PDF sheets of prefetched dive logs"""
+    
+    report_done = pyqtSignal(int)  # number of sheets processed so far
+    
+    def __init__(self, sheets, folder):
+        super().__init__()
+        self.sheets = sheets  # list of (dive, team)
+        self.folder = folder
+        self.generated = 0
+    
+    def run(self):
+        """Write the reports"""
+        from utils.report_generator import render_dive_sheet
+        
+        for index, (dive, team) in enumerate(self.sheets, 1):
+            if self.isInterruptionRequested():
+                break
+            dive_number = dive['dive_number']
+            filename = os.path.join(self.folder, f"divelog_{dive_number}.pdf")
+            try:
+                render_dive_sheet(dive, team, filename)
+                self.generated += 1
+            except Exception as e:
+                QgsMessageLog.logMessage(f"Error generating report for {dive_number}: {e}",
+                                         "Shipwreck", Qgis.Warning)
+            self.report_done.emit(index)
+
+
+# Background workers still running, kept alive if their dialog is closed first
+_running_workers = set()
+
+
+IMAGE_EXTENSIONS = frozenset(('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.tif'))
+
+
+def _is_supported_image(file_path):
+    """Check if a dropped file has an image extension the dive log accepts"""
+    return os.path.splitext(file_path)[1].lower() in IMAGE_EXTENSIONS
+
+
+class MediaDropListView(QListView):
+    """Custom QListView that accepts drag and drop of image files"""
     
     files_dropped = pyqtSignal(list)
     
@@ -39,7 +335,7 @@ class MediaDropListWidget(QListWidget):
             # Check if any of the URLs are image files
             for url in event.mimeData().urls():
                 file_path = url.toLocalFile()
-                if file_path.lower().endswith(('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.tif')):
+                if _is_supported_image(file_path):
                     event.acceptProposedAction()
                     return
         event.ignore()
@@ -55,7 +351,7 @@ class MediaDropListWidget(QListWidget):
             files = []
             for url in event.mimeData().urls():
                 file_path = url.toLocalFile()
-                if os.path.isfile(file_path) and file_path.lower().endswith(('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.tif')):
+                if _is_supported_image(file_path) and os.path.isfile(file_path):
                     files.append(file_path)
             
             if files:
@@ -74,6 +370,7 @@ class DiveLogDialog(QDialog):
         super().__init__(parent)
         self.db_manager = db_manager
         self.site_id = site_id
+        self.site_code = None
         self.dive_id = dive_id
         self.setWindowTitle(self.tr("Dive Log Entry"))
         self.setModal(True)
@@ -81,6 +378,10 @@ class DiveLogDialog(QDialog):
         self.resize(500, 450)
         self.media_folder = self.setup_media_folder()
         
+        # Keep the previews of media shared by several dives decoded between dialogs
+        if QPixmapCache.cacheLimit() < PREVIEW_CACHE_KB:
+            QPixmapCache.setCacheLimit(PREVIEW_CACHE_KB)
+        
         # Initialize team_members before init_ui
         self.team_members = []
         
@@ -204,21 +505,21 @@ class DiveLogDialog(QDialog):
         
         # Objectives
         work_layout.addWidget(QLabel(self.tr("Objectives:")))
-        self.objectives_edit = QTextEdit()
+        self.objectives_edit = QPlainTextEdit()
         self.objectives_edit.setMaximumHeight(80)
         self.objectives_edit.setPlaceholderText(self.tr("What was planned for this dive..."))
         work_layout.addWidget(self.objectives_edit)
         
         # Work completed
         work_layout.addWidget(QLabel(self.tr("Work Done:")))
-        self.work_edit = QTextEdit()
+        self.work_edit = QPlainTextEdit()
         self.work_edit.setMaximumHeight(80)
         self.work_edit.setPlaceholderText(self.tr("What was actually accomplished..."))
         work_layout.addWidget(self.work_edit)
         
         # Findings
         work_layout.addWidget(QLabel(self.tr("Findings:")))
-        self.findings_edit = QTextEdit()
+        self.findings_edit = QPlainTextEdit()
         self.findings_edit.setMaximumHeight(80)
         self.findings_edit.setPlaceholderText(self.tr("Summary of finds or observations..."))
         work_layout.addWidget(self.findings_edit)
@@ -246,7 +547,6 @@ class DiveLogDialog(QDialog):
         # Worker selection
         worker_layout = QHBoxLayout()
         self.worker_combo = QComboBox()
-        self.load_workers()
         worker_layout.addWidget(self.worker_combo)
         
         self.role_combo = QComboBox()
@@ -279,10 +579,12 @@ class DiveLogDialog(QDialog):
         media_group = QGroupBox(self.tr("Media (Drag && Drop)"))
         media_layout = QVBoxLayout()
         
-        self.media_list = MediaDropListWidget()
+        self.media_model = DiveMediaModel(self)
+        self.media_list = MediaDropListView()
+        self.media_list.setModel(self.media_model)
         self.media_list.setIconSize(QSize(64, 64))
         self.media_list.setMaximumHeight(120)
-        self.media_list.setFlow(QListWidget.LeftToRight)
+        self.media_list.setFlow(QListView.LeftToRight)
         self.media_list.setWrapping(True)
         self.media_list.files_dropped.connect(self.handle_dropped_files)
         
@@ -292,19 +594,19 @@ class DiveLogDialog(QDialog):
         
         # Notes
         team_layout.addWidget(QLabel(self.tr("Notes:")))
-        self.notes_edit = QTextEdit()
+        self.notes_edit = QPlainTextEdit()
         self.notes_edit.setMaximumHeight(60)
         team_layout.addWidget(self.notes_edit)
         
         team_layout.addStretch()
         team_tab.setLayout(team_layout)
-        self.tabs.addTab(team_tab, self.tr("Team & Notes"))
+        self.team_tab_index = self.tabs.addTab(team_tab, self.tr("Team & Notes"))
         
-        layout.addWidget(self.tabs)
+        # Workers and media are only loaded once their tab is shown
+        self.team_tab_loaded = False
+        self.tabs.currentChanged.connect(self.on_tab_changed)
         
-        # Load associated media if editing
-        if self.dive_id:
-            self.load_media_previews()
+        layout.addWidget(self.tabs)
         
         # Buttons
         buttons = QDialogButtonBox(
@@ -317,19 +619,20 @@ class DiveLogDialog(QDialog):
         
         self.setLayout(layout)
     
+    def on_tab_changed(self, index):
+        """Load the workers and media of the Team & Notes tab the first time it is shown"""
+        if index != self.team_tab_index or self.team_tab_loaded:
+            return
+        self.team_tab_loaded = True
+        
+        self.load_workers()
+        # Load associated media if editing
+        if self.dive_id:
+            self.load_media_previews()
+    
     def generate_dive_number(self):
         """Generate next dive number"""
-        # First get site code
-        sites = self.db_manager.execute_query(
-            "SELECT site_code FROM sites WHERE id = ?",
-            (self.site_id,)
-        )
-        
-        site_code = "SITE"
-        if sites:
-            site_code = sites[0]['site_code'] if isinstance(sites[0], dict) else sites[0][0]
-        
-        # Get last dive number for this site
+        # Get last dive number for this site (an index seek on site_id, dive_date)
         result = self.db_manager.execute_query(
             """SELECT dive_number FROM dive_logs 
                WHERE site_id = ? 
@@ -339,53 +642,56 @@ class DiveLogDialog(QDialog):
         )
         
         if result:
-            last_number = result[0][0] if isinstance(result[0], tuple) else result[0].get('dive_number')
+            last_number = result[0]['dive_number']
             # Extract number and increment
             try:
                 # Try to find the last numeric part
-                import re
-                numbers = re.findall(r'\d+', last_number)
+                numbers = DIVE_NUMBER_RE.findall(last_number)
                 if numbers:
                     # Get the last number and increment it
                     last_num = int(numbers[-1])
                     new_num = last_num + 1
                     # Replace the last number with the new one
-                    new_number = re.sub(r'\d+(?!.*\d)', f'{new_num:03d}', last_number)
+                    new_number = LAST_DIVE_NUMBER_RE.sub(f'{new_num:03d}', last_number)
                 else:
                     # No number found, append 001
                     new_number = f"{last_number}-001"
             except:
-                new_number = f"{site_code}-{date.today().year}-001"
+                new_number = f"{self.get_site_code()}-{date.today().year}-001"
         else:
             # First dive for this site
-            new_number = f"{site_code}-{date.today().year}-001"
+            new_number = f"{self.get_site_code()}-{date.today().year}-001"
         
         self.dive_number_edit.setText(new_number)
     
+    def get_site_code(self):
+        """Get the code of the dive's site, only queried when a new numbering starts"""
+        if self.site_code is None:
+            sites = self.db_manager.execute_query(
+                "SELECT site_code FROM sites WHERE id = ?",
+                (self.site_id,)
+            )
+            self.site_code = sites[0]['site_code'] if sites else "SITE"
+        return self.site_code
+    
     def load_workers(self):
         """Load active workers"""
-        workers = self.db_manager.execute_query(
-            "SELECT id, full_name FROM workers WHERE active = 1 ORDER BY full_name"
-        )
+        workers = get_active_workers(self.db_manager)
         
+        # Fill the combo without emitting a change signal for every item
+        self.worker_combo.blockSignals(True)
         self.worker_combo.clear()
         self.worker_combo.addItem(self.tr("Select worker..."), None)
-        
-        if workers:
-            for worker in workers:
-                if isinstance(worker, dict):
-                    self.worker_combo.addItem(worker['full_name'], worker['id'])
-                else:
-                    self.worker_combo.addItem(worker[1], worker[0])
+        for worker_id, full_name in workers:
+            self.worker_combo.addItem(full_name, worker_id)
+        self.worker_combo.blockSignals(False)
     
     def add_team_member(self):
         """Add team member to list"""
         worker_id = self.worker_combo.currentData()
-        current_index = self.worker_combo.currentIndex()
-        print(f"DEBUG add_team_member: current_index={current_index}, worker_id={worker_id}, worker_name={self.worker_combo.currentText()}")
         
         if not worker_id:
-            print(f"DEBUG: No worker selected (worker_id is None)")
+            logger.debug("No worker selected")
             return
         
         worker_name = self.worker_combo.currentText()
@@ -405,12 +711,11 @@ class DiveLogDialog(QDialog):
         item_text = f"{worker_name} - {role}"
         self.team_list.addItem(item_text)
         
-        print(f"DEBUG: Adding team member - worker_id={worker_id}, worker_name={worker_name}, role={role}")
         self.team_members.append({
             'worker_id': worker_id,
             'role': role
         })
-        print(f"DEBUG: Total team members now: {len(self.team_members)}")
+        logger.debug("Added team member %s (%s), team size %d", worker_id, role, len(self.team_members))
         
         # Reset combo
         self.worker_combo.setCurrentIndex(0)
@@ -428,7 +733,6 @@ class DiveLogDialog(QDialog):
     def load_dive_data(self):
         """Load existing dive data"""
         try:
-            print(f"DEBUG DiveLogDialog: Loading dive ID {self.dive_id}")
             # Query specific fields to ensure we know the order
             dive = self.db_manager.execute_query(
                 """SELECT id, site_id, dive_number, dive_date, dive_start, dive_end,
@@ -438,139 +742,116 @@ class DiveLogDialog(QDialog):
                    FROM dive_logs WHERE id = ?""",
                 (self.dive_id,)
             )
-            print(f"DEBUG DiveLogDialog: Query returned {len(dive) if dive else 0} results")
         except Exception as e:
-            print(f"ERROR DiveLogDialog: Failed to load dive data: {e}")
-            QMessageBox.warning(self, self.tr("Error"), self.tr(f"Failed to load dive data: {str(e)}"))
+            QgsMessageLog.logMessage(f"Failed to load dive {self.dive_id}: {e}", "Shipwreck", Qgis.Warning)
+            QMessageBox.warning(self, self.tr("Error"), self.tr("Failed to load dive data: {0}").format(str(e)))
             return
         
         if dive and len(dive) > 0:
             data = dive[0]
             
-            # Map tuple indices to field names
-            field_map = {
-                'dive_number': 2,
-                'dive_date': 3,
-                'dive_start': 4,
-                'dive_end': 5,
-                'max_depth': 6,
-                'avg_depth': 7,
-                'water_temp': 8,
-                'visibility': 9,
-                'current_strength': 10,
-                'weather_conditions': 11,
-                'dive_objectives': 12,
-                'work_completed': 13,
-                'findings_summary': 14,
-                'equipment_used': 15,
-                'notes': 16
-            }
-            
-            # Helper to get value by field name
-            def get_value(data, field_name):
-                # Check if data is a dictionary (from Supabase)
-                if isinstance(data, dict):
-                    return data.get(field_name)
-                # Otherwise it's a tuple/list from direct query
-                elif field_name in field_map:
-                    idx = field_map[field_name]
-                    if idx < len(data):
-                        return data[idx]
-                return None
+            # Unpack the row once, in the order of the selected columns
+            if isinstance(data, dict):
+                # Dictionary rows (Supabase/PostgreSQL)
+                (dive_number, dive_date, dive_start, dive_end, max_depth, avg_depth,
+                 water_temp, visibility, current_strength, weather_conditions,
+                 dive_objectives, work_completed, findings_summary, equipment_used,
+                 notes) = (data.get(field) for field in DIVE_LOG_FIELDS)
+            else:
+                (_, _, dive_number, dive_date, dive_start, dive_end, max_depth, avg_depth,
+                 water_temp, visibility, current_strength, weather_conditions,
+                 dive_objectives, work_completed, findings_summary, equipment_used,
+                 notes) = data
             
             # Populate fields
-            if get_value(data, 'dive_number'):
-                self.dive_number_edit.setText(str(get_value(data, 'dive_number')))
+            if dive_number:
+                self.dive_number_edit.setText(str(dive_number))
             
-            if get_value(data, 'dive_date'):
-                date_str = str(get_value(data, 'dive_date'))
+            if dive_date:
+                date_str = str(dive_date)
                 date = QDate.fromString(date_str, 'yyyy-MM-dd')
                 if date.isValid():
                     self.dive_date.setDate(date)
             
-            if get_value(data, 'dive_start'):
-                time_str = str(get_value(data, 'dive_start'))
+            if dive_start:
+                time_str = str(dive_start)
                 time = QTime.fromString(time_str, 'HH:mm:ss')
                 if not time.isValid():
                     time = QTime.fromString(time_str, 'HH:mm')
                 if time.isValid():
                     self.start_time.setTime(time)
             
-            if get_value(data, 'dive_end'):
-                time_str = str(get_value(data, 'dive_end'))
+            if dive_end:
+                time_str = str(dive_end)
                 time = QTime.fromString(time_str, 'HH:mm:ss')
                 if not time.isValid():
                     time = QTime.fromString(time_str, 'HH:mm')
                 if time.isValid():
                     self.end_time.setTime(time)
             
-            if get_value(data, 'max_depth'):
-                self.max_depth.setValue(float(get_value(data, 'max_depth')))
+            if max_depth:
+                self.max_depth.setValue(float(max_depth))
             
-            if get_value(data, 'avg_depth'):
-                self.avg_depth.setValue(float(get_value(data, 'avg_depth')))
+            if avg_depth:
+                self.avg_depth.setValue(float(avg_depth))
             
-            if get_value(data, 'water_temp'):
-                self.water_temp.setValue(float(get_value(data, 'water_temp')))
+            if water_temp:
+                self.water_temp.setValue(float(water_temp))
             
-            if get_value(data, 'visibility'):
-                self.visibility.setValue(float(get_value(data, 'visibility')))
+            if visibility:
+                self.visibility.setValue(float(visibility))
             
-            if get_value(data, 'current_strength'):
-                idx = self.current_combo.findText(str(get_value(data, 'current_strength')))
+            if current_strength:
+                idx = self.current_combo.findText(str(current_strength))
                 if idx >= 0:
                     self.current_combo.setCurrentIndex(idx)
             
-            if get_value(data, 'weather_conditions'):
-                self.weather_edit.setText(str(get_value(data, 'weather_conditions')))
+            if weather_conditions:
+                self.weather_edit.setText(str(weather_conditions))
             
-            if get_value(data, 'dive_objectives'):
-                self.objectives_edit.setText(str(get_value(data, 'dive_objectives')))
+            if dive_objectives:
+                self.objectives_edit.setPlainText(str(dive_objectives))
             
-            if get_value(data, 'work_completed'):
-                self.work_edit.setText(str(get_value(data, 'work_completed')))
+            if work_completed:
+                self.work_edit.setPlainText(str(work_completed))
             
-            if get_value(data, 'findings_summary'):
-                self.findings_edit.setText(str(get_value(data, 'findings_summary')))
+            if findings_summary:
+                self.findings_edit.setPlainText(str(findings_summary))
             
-            if get_value(data, 'equipment_used'):
-                self.equipment_edit.setText(str(get_value(data, 'equipment_used')))
+            if equipment_used:
+                self.equipment_edit.setText(str(equipment_used))
             
-            if get_value(data, 'notes'):
-                self.notes_edit.setText(str(get_value(data, 'notes')))
+            if notes:
+                self.notes_edit.setPlainText(str(notes))
             
-            # Load team members
+            # Load team members with their names in a single query
             team_members = self.db_manager.execute_query(
-                "SELECT * FROM dive_team WHERE dive_id = ?",
+                """SELECT dt.worker_id, dt.role, w.full_name
+                   FROM dive_team dt
+                   JOIN workers w ON w.id = dt.worker_id
+                   WHERE dt.dive_id = ?""",
                 (self.dive_id,)
             )
             
-            print(f"DEBUG: Loading {len(team_members) if team_members else 0} team members for dive {self.dive_id}")
-            
             if team_members:
-                for i, member in enumerate(team_members):
-                    worker_id = member['worker_id'] if isinstance(member, dict) else member[2]
-                    role = member['role'] if isinstance(member, dict) else member[3]
-                    
-                    print(f"DEBUG: Loading team member {i+1} - worker_id={worker_id}, role={role}")
-                    
-                    # Get worker name
-                    workers = self.db_manager.execute_query(
-                        "SELECT full_name FROM workers WHERE id = ?",
-                        (worker_id,)
-                    )
-                    
-                    if workers:
-                        worker_name = workers[0]['full_name'] if isinstance(workers[0], dict) else workers[0][0]
-                        item_text = f"{worker_name} - {role}"
-                        self.team_list.addItem(item_text)
-                        print(f"DEBUG: Added to list: {item_text}")
-                        self.team_members.append({
-                            'worker_id': worker_id,
-                            'role': role
-                        })
-            
-            print(f"DEBUG: Total team members loaded: {len(self.team_members)}")
+                item_texts = []
+                for member in team_members:
+                    worker_id = member['worker_id']
+                    role = member['role']
+                    item_texts.append(f"{member['full_name']} - {role}")
+                    self.team_members.append({
+                        'worker_id': worker_id,
+                        'role': role
+                    })
+                
+                # Add the whole team with a single relayout of the list
+                self.team_list.setUpdatesEnabled(False)
+                self.team_list.blockSignals(True)
+                try:
+                    self.team_list.addItems(item_texts)
+                finally:
+                    self.team_list.blockSignals(False)
+                    self.team_list.setUpdatesEnabled(True)
     
     def load_media_previews(self):
         """Load media previews for the dive log"""
@@ -580,64 +861,68 @@ class DiveLogDialog(QDialog):
         # Use the database manager method for media
         media_files = self.db_manager.get_media_for_item('dive_log', self.dive_id)
         
+        # Look up the media base path once, not for every media file
+        media_base = self.db_manager.get_setting('media_base_path')
+        if media_base:
+            # Remove 'media' from the base path if it's already included
+            if media_base.endswith('/media') or media_base.endswith('\\media'):
+                base_path = os.path.dirname(media_base)
+            else:
+                base_path = media_base
+        else:
+            base_path = None
+        # List the thumbnails once instead of checking every media file on disk
+        thumbs_dir = os.path.join(self.media_folder, 'thumbnails')
+        try:
+            with os.scandir(thumbs_dir) as entries:
+                thumb_names = {entry.name for entry in entries}
+        except OSError:
+            thumb_names = set()
+        
+        # Normalize path separators for the current OS in a single pass
+        to_os_sep = str.maketrans({'/': os.sep, '\\': os.sep})
+        
+        def resolve(file_path):
+            """Return the existing location of a stored media path, or None"""
+            # Check if it's an absolute path
+            if os.path.isabs(file_path) and os.path.exists(file_path):
+                return file_path
+            # It's a relative path, first try it from the current directory
+            if os.path.exists(file_path):
+                return file_path
+            if base_path:
+                # Try with configured media base path
+                full_drive_path = os.path.join(base_path, file_path.translate(to_os_sep))
+                if os.path.exists(full_drive_path):
+                    return full_drive_path
+            return None
+        
+        rows = []
         if media_files:
+            # All rows of a query have the same type, so pick the accessor once
+            if isinstance(media_files[0], dict):
+                media_fields = itemgetter('file_name', 'file_path', 'media_type')
+            else:
+                media_fields = itemgetter(1, 2, 3)
             for media in media_files:
-                if isinstance(media, dict):
-                    filename = media['file_name']
-                    file_path = media['file_path']
-                    media_type = media['media_type']
-                else:
-                    filename = media[1]
-                    file_path = media[2]
-                    media_type = media[3]
+                filename, file_path, media_type = media_fields(media)
                 
-                item = QListWidgetItem(filename)
-                item.setToolTip(filename)
-                
-                # Set thumbnail for images
+                # Find the image to preview - it is only decoded once visible
+                image_path = None
                 if media_type == 'photo' and file_path:
-                    pixmap = None
-                    
-                    # Check if it's an absolute path
-                    if os.path.isabs(file_path) and os.path.exists(file_path):
-                        pixmap = QPixmap(file_path)
+                    thumb_name = f'thumb_{os.path.basename(file_path.translate(to_os_sep))}'
+                    if thumb_name in thumb_names:
+                        image_path = os.path.join(thumbs_dir, thumb_name)
                     else:
-                        # It's a relative path, try different combinations
-                        # First, just the relative path from current directory
-                        if os.path.exists(file_path):
-                            pixmap = QPixmap(file_path)
-                        else:
-                            # Try with configured media base path
-                            media_base = self.db_manager.get_setting('media_base_path')
-                            if media_base:
-                                # Remove 'media' from the base path if it's already included
-                                if media_base.endswith('/media') or media_base.endswith('\\media'):
-                                    base_path = os.path.dirname(media_base)
-                                else:
-                                    base_path = media_base
-                                
-                                # Normalize the path for the current OS
-                                # Replace forward slashes with OS-specific separator
-                                normalized_file_path = file_path.replace('/', os.sep).replace('\\', os.sep)
-                                full_drive_path = os.path.join(base_path, normalized_file_path)
-                            else:
-                                # No configured path, try relative to current directory
-                                full_drive_path = file_path
-                            if os.path.exists(full_drive_path):
-                                pixmap = QPixmap(full_drive_path)
-                    
-                    if pixmap and not pixmap.isNull():
-                        scaled_pixmap = pixmap.scaled(64, 64, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                        item.setIcon(QIcon(scaled_pixmap))
+                        image_path = resolve(file_path)
                 
-                self.media_list.addItem(item)
+                rows.append({'name': filename, 'path': image_path})
+        
+        self.media_model.set_media(rows)
     
     def get_thumbnail_path(self, image_path):
         """Get thumbnail path for image"""
-        # Assuming thumbnails are stored in a thumbnails folder
-        base_dir = os.path.dirname(os.path.dirname(image_path))
-        filename = os.path.basename(image_path)
-        return os.path.join(base_dir, 'thumbnails', f'thumb_{filename}')
+        return thumbnail_path(image_path)
     
     def setup_media_folder(self):
         """Setup media storage folder"""
@@ -665,101 +950,73 @@ class DiveLogDialog(QDialog):
                     try:
                         os.makedirs(folder)
                     except Exception as e:
-                        print(f"Warning: Could not create media folder {folder}: {e}")
+                        QgsMessageLog.logMessage(f"Could not create media folder {folder}: {e}",
+                                                 "Shipwreck", Qgis.Warning)
                     
             return media_folder
         except Exception as e:
-            print(f"Warning: Error setting up media folder: {e}")
+            QgsMessageLog.logMessage(f"Error setting up media folder: {e}", "Shipwreck", Qgis.Warning)
             # Return a safe default
             return os.path.expanduser("~/Documents/ShipwreckMedia")
     
     def handle_dropped_files(self, files):
         """Handle dropped image files"""
-        added = 0
-        for file_path in files:
-            if self.add_media_file(file_path):
-                added += 1
-        
-        if added > 0:
+        added = []
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        for index, file_path in enumerate(files):
+            dest_path = self.add_media_file(file_path, timestamp, index)
+            if dest_path:
+                added.append((dest_path, self.get_thumbnail_path(dest_path)))
+        
+        if added:
+            # Thumbnails are made in the background and replace the placeholders
+            worker = ThumbnailWorker(added)
+            worker.thumbnail_ready.connect(self.media_model.set_preview)
+            _running_workers.add(worker)
+            worker.finished.connect(lambda: _running_workers.discard(worker))
+            worker.start()
+            
             QMessageBox.information(
                 self,
                 self.tr("Success"),
-                self.tr(f"Added {added} image(s) to this dive log")
+                self.tr("Added {0} image(s) to this dive log").format(len(added))
             )
     
-    def add_media_file(self, file_path):
-        """Add a media file"""
+    def add_media_file(self, file_path, timestamp, index):
+        """Copy a media file to the media folder and list it, return the copy's path"""
         try:
             # Copy file to media folder
-            filename = os.path.basename(file_path)
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            new_filename = f"{timestamp}_{filename}"
-            dest_path = os.path.join(self.media_folder, 'photos', new_filename)
+            filename, new_filename, dest_path = prepare_media(
+                file_path, os.path.join(self.media_folder, 'photos'), timestamp, index)
             
-            shutil.copy2(file_path, dest_path)
+            # Only the content matters, the copy is renamed with a timestamp anyway.
+            # copyfile streams it in chunks (kernel side where the platform allows),
+            # so large photos are never read into memory as a whole
+            shutil.copyfile(file_path, dest_path)
             
-            # Create thumbnail
-            self.create_thumbnail(dest_path)
-            
-            # Add to list widget immediately
-            item = QListWidgetItem(filename)
-            item.setToolTip(filename)
-            
-            # Set thumbnail
-            thumb_path = self.get_thumbnail_path(dest_path)
-            if os.path.exists(thumb_path):
-                pixmap = QPixmap(thumb_path)
-            else:
-                pixmap = QPixmap(dest_path)
-            
-            if not pixmap.isNull():
-                scaled_pixmap = pixmap.scaled(64, 64, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                item.setIcon(QIcon(scaled_pixmap))
-            
-            # Store file info for later saving
-            item.setData(Qt.UserRole, {
-                'file_name': new_filename,
-                'file_path': dest_path,
-                'file_size': os.path.getsize(file_path)
+            # Add to the list immediately, the preview is set once its thumbnail exists
+            self.media_model.add_media({
+                'name': filename,
+                'path': None,
+                # Store file info for later saving
+                'new': {
+                    'file_name': new_filename,
+                    'file_path': dest_path,
+                    'file_size': os.stat(dest_path).st_size
+                }
             })
-            
-            self.media_list.addItem(item)
-            return True
+            return dest_path
             
         except Exception as e:
             QMessageBox.warning(
                 self,
                 self.tr("Error"),
-                self.tr(f"Failed to add image: {str(e)}")
+                self.tr("Failed to add image: {0}").format(str(e))
             )
-            return False
-    
-    def create_thumbnail(self, image_path):
-        """Create thumbnail for image"""
-        try:
-            from PIL import Image
-            
-            thumb_path = self.get_thumbnail_path(image_path)
-            
-            with Image.open(image_path) as img:
-                img.thumbnail((150, 150))
-                img.save(thumb_path)
-                
-        except ImportError:
-            # PIL not available, try Qt
-            try:
-                pixmap = QPixmap(image_path)
-                if not pixmap.isNull():
-                    thumb_path = self.get_thumbnail_path(image_path)
-                    scaled = pixmap.scaled(150, 150, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                    scaled.save(thumb_path)
-            except:
-                pass
-        except Exception:
-            pass
+            return None
     
     def get_dive_data(self):
-        """Get dive data from form"""
+        """Get dive data from form, keyed in DIVE_LOG_COLUMNS order"""
         return {
             'site_id': self.site_id,
             'dive_number': self.dive_number_edit.text(),
@@ -792,61 +1049,35 @@ class DiveLogDialog(QDialog):
         # Get dive data
         dive_data = self.get_dive_data()
         
-        if self.dive_id:
-            # Update existing dive
-            set_clause = ', '.join([f"{k} = ?" for k in dive_data.keys()])
-            values = list(dive_data.values()) + [self.dive_id]
-            
-            success = self.db_manager.execute_update(
-                f"UPDATE dive_logs SET {set_clause} WHERE id = ?",
-                values
-            )
-            dive_id = self.dive_id if success else None
-            
-            # Update team members
-            if dive_id:
-                # Delete existing team members
-                self.db_manager.execute_update(
-                    "DELETE FROM dive_team WHERE dive_id = ?",
-                    (dive_id,)
-                )
-                
-                # Add new team members
-                print(f"DEBUG: Saving {len(self.team_members)} team members for dive {dive_id}")
-                for i, member in enumerate(self.team_members):
-                    print(f"DEBUG: Team member {i+1}: worker_id={member['worker_id']}, role={member['role']}")
-                    self.db_manager.execute_update(
-                        """INSERT INTO dive_team (dive_id, worker_id, role)
-                           VALUES (?, ?, ?)""",
-                        (dive_id, member['worker_id'], member['role'])
+        # Save the dive, its team and its media as one transaction
+        try:
+            with self.db_manager.transaction():
+                if self.dive_id:
+                    # Update existing dive
+                    success = self.db_manager.execute_update(
+                        UPDATE_DIVE_LOG_SQL,
+                        list(dive_data.values()) + [self.dive_id]
                     )
-        else:
-            # Insert new dive
-            columns = ', '.join(dive_data.keys())
-            placeholders = ', '.join(['?' for _ in dive_data])
-            
-            dive_id = self.db_manager.execute_update(
-                f"INSERT INTO dive_logs ({columns}) VALUES ({placeholders})",
-                list(dive_data.values())
-            )
-            
-            if dive_id:
-                # Add team members
-                for member in self.team_members:
-                    self.db_manager.execute_update(
-                        """INSERT INTO dive_team (dive_id, worker_id, role)
-                           VALUES (?, ?, ?)""",
-                        (dive_id, member['worker_id'], member['role'])
+                    dive_id = self.dive_id if success else None
+                else:
+                    # Insert new dive
+                    dive_id = self.db_manager.execute_update(
+                        INSERT_DIVE_LOG_SQL,
+                        list(dive_data.values())
                     )
-        
-        if dive_id:
-            # Save any new media files
-            for i in range(self.media_list.count()):
-                item = self.media_list.item(i)
-                media_data = item.data(Qt.UserRole)
                 
-                # Only process items with user data (newly added)
-                if media_data:
+                if not dive_id:
+                    raise RuntimeError(self.tr("The dive log was not written"))
+                
+                if self.dive_id:
+                    # Update team members, only writing the ones that changed
+                    update_dive_team(self.db_manager, dive_id, self.team_members)
+                else:
+                    # Add team members in one batch
+                    insert_dive_team(self.db_manager, dive_id, self.team_members)
+                
+                # Save any new media files
+                for media_data in self.media_model.new_media():
                     media_record = {
                         'media_type': 'photo',
                         'file_name': media_data['file_name'],
@@ -857,6 +1088,15 @@ class DiveLogDialog(QDialog):
                     }
                     
                     self.db_manager.add_media(media_record, 'dive', dive_id)
+        except Exception as e:
+            # The transaction was rolled back, keep the dialog open to retry
+            QgsMessageLog.logMessage(f"Error saving dive log: {e}", "Shipwreck", Qgis.Warning)
+            QMessageBox.critical(
+                self,
+                self.tr("Error"),
+                self.tr("Failed to save dive log: {0}").format(str(e))
+            )
+            return
         
         super().accept()
     
@@ -872,6 +1112,9 @@ class DiveLogWidget(QWidget):
         self.iface = iface
         self.db_manager = db_manager
         self.current_site_id = None
+        # Dive rows and site statistics per (site id, year filter) seen since the last refresh
+        self.dives_cache = {}
+        self.report_generator_class = None
         self.init_ui()
         
     def init_ui(self):
@@ -957,6 +1200,8 @@ class DiveLogWidget(QWidget):
     
     def load_sites(self):
         """Load sites into combo box"""
+        # Sites were changed, so forget the dives shown for the old ones
+        self.dives_cache.clear()
         self.site_combo.clear()
         self.site_combo.addItem(self.tr("Select Site..."), None)
         
@@ -965,30 +1210,91 @@ class DiveLogWidget(QWidget):
             sites = self.db_manager.execute_query(
                 "SELECT id, site_name FROM sites WHERE status = 'active' ORDER BY site_name"
             )
-            print(f"DEBUG: DiveLog widget - Loading sites, found {len(sites) if sites else 0} sites")
+            logger.debug("Dive logs: found %d sites", len(sites) if sites else 0)
         except Exception as e:
-            print(f"ERROR loading sites in DiveLog widget: {e}")
+            logger.error("Error loading sites for dive logs: %s", e)
             sites = []
         
         if sites:
+            site_fields = itemgetter('site_name', 'id') if isinstance(sites[0], dict) else itemgetter(1, 0)
             for site in sites:
-                if isinstance(site, dict):
-                    self.site_combo.addItem(site['site_name'], site['id'])
-                else:
-                    self.site_combo.addItem(site[1], site[0])
+                self.site_combo.addItem(*site_fields(site))
     
     def on_site_changed(self, index):
         """Handle site selection change"""
         self.current_site_id = self.site_combo.currentData()
-        self.refresh_data()
+        self.refresh_data(use_cache=True)
     
-    def refresh_data(self):
-        """Refresh dive logs table"""
+    def refresh_data(self, use_cache=False):
+        """Refresh dive logs table
+        
+        With use_cache, a site and year already shown since the last refresh are
+        redisplayed without querying the database again.
+        """
+        if not use_cache:
+            self.dives_cache.clear()
+        
         if not self.current_site_id:
             self.dives_table.setRowCount(0)
             self.update_statistics()
             return
         
+        key = (self.current_site_id, self.year_combo.currentText())
+        cached = self.dives_cache.get(key)
+        if cached is None:
+            cached = self.dives_cache[key] = self.query_dives()
+        dives, site_stats = cached
+        
+        # Fill the table without relayouts, repaints or content resizes per cell
+        header = self.dives_table.horizontalHeader()
+        sorting = self.dives_table.isSortingEnabled()
+        self.dives_table.setUpdatesEnabled(False)
+        self.dives_table.setSortingEnabled(False)
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        try:
+            self.dives_table.setRowCount(0)
+            
+            if dives:
+                self.dives_table.setRowCount(len(dives))
+                
+                for row, dive in enumerate(dives):
+                    # query_dives returns dict rows for every backend
+                    # The SQL query only returns the first 100 characters of the findings
+                    summary = dive.get('findings_summary') or ''
+                    summary_len = dive.get('findings_len') or len(summary)
+                    values = [
+                        str(dive.get('id', '')),
+                        dive.get('dive_number', ''),
+                        dive.get('dive_date', ''),
+                        dive.get('time_range', ''),
+                        f"{dive.get('max_depth', 0):.1f} m" if dive.get('max_depth') else '',
+                        f"{dive.get('duration_min', 0)} min" if dive.get('duration_min') else '',
+                        str(dive.get('team_size', 0)),
+                        str(dive.get('media_count', 0)),  # Media count column
+                        f"{dive.get('visibility', 0):.1f} m" if dive.get('visibility') else '',
+                        dive.get('current_strength', ''),
+                        summary[:100] + '...' if summary_len > 100 else summary
+                    ]
+                    
+                    for col, value in enumerate(values):
+                        self.dives_table.setItem(
+                            row, col, QTableWidgetItem('' if value is None else str(value)))
+        finally:
+            header.setSectionResizeMode(QHeaderView.ResizeToContents)
+            header.setSectionResizeMode(10, QHeaderView.Stretch)
+            self.dives_table.setSortingEnabled(sorting)
+            self.dives_table.setUpdatesEnabled(True)
+        
+        if site_stats:
+            self.show_statistics(*site_stats)
+        else:
+            self.stats_label.setText(self.tr("No dives recorded for this site"))
+    
+    def query_dives(self):
+        """Return the dives of the current site and year filter, and the site statistics"""
+        # Site statistics, read from the dive rows when the query can include them
+        site_stats = None
+        
         # Check if we have the special method for Supabase
         if hasattr(self.db_manager, 'get_dive_logs_for_widget'):
             # Use the Supabase-specific method
@@ -998,13 +1304,13 @@ class DiveLogWidget(QWidget):
             # Use SQL query for SQLite
             # Build query
             query = """
-                SELECT d.id, d.dive_number, d.dive_date, 
-                       d.dive_start || ' - ' || d.dive_end as time_range,
+                SELECT d.id, d.dive_number, d.dive_date, d.dive_start, d.dive_end,
                        d.max_depth, 
-                       CAST((julianday(d.dive_end) - julianday(d.dive_start)) * 24 * 60 AS INTEGER) as duration_min,
                        COUNT(DISTINCT dt.worker_id) as team_size,
                        COUNT(DISTINCT mr.media_id) as media_count,
-                       d.visibility, d.current_strength, d.findings_summary
+                       d.visibility, d.current_strength,
+                       substr(d.findings_summary, 1, 100) as findings_summary,
+                       length(d.findings_summary) as findings_len{stats}
                 FROM dive_logs d
                 LEFT JOIN dive_team dt ON dt.dive_id = d.id
                 LEFT JOIN media_relations mr ON mr.related_id = d.id AND mr.related_type = 'dive_log'
@@ -1018,54 +1324,38 @@ class DiveLogWidget(QWidget):
             if year_filter != self.tr("All"):
                 query += " AND strftime('%Y', d.dive_date) = ?"
                 params.append(year_filter)
+                query = query.format(stats='')
+            else:
+                # All dives of the site are listed, so compute its statistics alongside
+                query = query.format(stats=DIVE_STATS_COLUMNS)
+                site_stats = (0, 0, 0, 0)
             
             query += " GROUP BY d.id ORDER BY d.dive_date DESC, d.dive_start DESC"
             
-            dives = self.db_manager.execute_query(query, params)
-        
-        self.dives_table.setRowCount(0)
-        
-        if dives:
-            self.dives_table.setRowCount(len(dives))
+            rows = self.db_manager.execute_query(query, params) or []
             
-            for row, dive in enumerate(dives):
-                # Handle both dict and tuple
-                if isinstance(dive, dict):
-                    values = [
-                        str(dive.get('id', '')),
-                        dive.get('dive_number', ''),
-                        dive.get('dive_date', ''),
-                        dive.get('time_range', ''),
-                        f"{dive.get('max_depth', 0):.1f} m" if dive.get('max_depth') else '',
-                        f"{dive.get('duration_min', 0)} min" if dive.get('duration_min') else '',
-                        str(dive.get('team_size', 0)),
-                        str(dive.get('media_count', 0)),  # Media count column
-                        f"{dive.get('visibility', 0):.1f} m" if dive.get('visibility') else '',
-                        dive.get('current_strength', ''),
-                        dive.get('findings_summary', '')[:100] + '...' if dive.get('findings_summary') else ''
-                    ]
-                else:
-                    values = []
-                    for i, val in enumerate(dive):
-                        if i == 4 and val:  # max_depth
-                            values.append(f"{val:.1f} m")
-                        elif i == 5 and val:  # duration
-                            values.append(f"{val} min")
-                        elif i == 7 and val:  # visibility
-                            values.append(f"{val:.1f} m")
-                        elif i == 9 and val:  # summary
-                            values.append((str(val)[:100] + '...') if len(str(val)) > 100 else str(val))
-                        else:
-                            values.append(str(val) if val else '')
-                
-                for col, value in enumerate(values):
-                    self.dives_table.setItem(row, col, QTableWidgetItem(value))
-        
-        self.update_statistics()
+            # Format the time range and duration here rather than for every row in SQL
+            dives = []
+            for row in rows:
+                dive = dict(row)
+                dive_start, dive_end = dive['dive_start'], dive['dive_end']
+                if dive_start is not None and dive_end is not None:
+                    dive['time_range'] = f"{dive_start} - {dive_end}"
+                dive['duration_min'] = minutes_between(dive_start, dive_end)
+                dives.append(dive)
+            
+            if dives and site_stats:
+                first = dives[0]
+                site_stats = (first['total_dives'], first['total_hours'] or 0,
+                              first['avg_depth_all'] or 0, first['max_depth_all'] or 0)
+        
+        if site_stats is None:
+            site_stats = self.query_statistics()
+        return dives, site_stats
     
     def filter_dives(self):
         """Filter dives by year"""
-        self.refresh_data()
+        self.refresh_data(use_cache=True)
     
     def update_statistics(self):
         """Update statistics label"""
@@ -1073,7 +1363,14 @@ class DiveLogWidget(QWidget):
             self.stats_label.setText("")
             return
         
-        # Get statistics
+        stats = self.query_statistics()
+        if stats:
+            self.show_statistics(*stats)
+        else:
+            self.stats_label.setText(self.tr("No dives recorded for this site"))
+    
+    def query_statistics(self):
+        """Return total dives, hours, average and maximum depth of the current site"""
         stats_result = self.db_manager.execute_query("""
             SELECT 
                 COUNT(*) as total_dives,
@@ -1085,25 +1382,19 @@ class DiveLogWidget(QWidget):
         """, (self.current_site_id,))
         
         if not stats_result or len(stats_result) == 0:
-            self.stats_label.setText(self.tr("No dives recorded for this site"))
-            return
+            return None
             
         stats = stats_result[0]
         
-        if isinstance(stats, dict):
-            total = stats.get('total_dives', 0)
-            hours = stats.get('total_hours', 0) or 0
-            avg_depth = stats.get('avg_depth', 0) or 0
-            max_depth = stats.get('max_depth', 0) or 0
-        else:
-            total = stats[0] or 0
-            hours = stats[1] or 0
-            avg_depth = stats[2] or 0
-            max_depth = stats[3] or 0
-        
+        # sqlite3.Row, RealDictRow and Supabase dicts all support key access
+        return (stats['total_dives'] or 0, stats['total_hours'] or 0,
+                stats['avg_depth'] or 0, stats['max_depth'] or 0)
+    
+    def show_statistics(self, total, hours, avg_depth, max_depth):
+        """Show the site's dive statistics"""
         self.stats_label.setText(
-            self.tr(f"Total dives: {total} | Total hours: {hours:.1f} | "
-                   f"Average depth: {avg_depth:.1f}m | Maximum depth: {max_depth:.1f}m")
+            self.tr("Total dives: {0} | Total hours: {1:.1f} | "
+                   "Average depth: {2:.1f}m | Maximum depth: {3:.1f}m").format(total, hours, avg_depth, max_depth)
         )
     
     def on_selection_changed(self):
@@ -1127,22 +1418,14 @@ class DiveLogWidget(QWidget):
             dive_data = dlg.get_dive_data()
             
             # Insert dive log
-            columns = ', '.join(dive_data.keys())
-            placeholders = ', '.join(['?' for _ in dive_data])
-            
             dive_id = self.db_manager.execute_update(
-                f"INSERT INTO dive_logs ({columns}) VALUES ({placeholders})",
+                INSERT_DIVE_LOG_SQL,
                 list(dive_data.values())
             )
             
             if dive_id:
-                # Add team members
-                for member in dlg.team_members:
-                    self.db_manager.execute_update(
-                        """INSERT INTO dive_team (dive_id, worker_id, role)
-                           VALUES (?, ?, ?)""",
-                        (dive_id, member['worker_id'], member['role'])
-                    )
+                # Add team members in one batch
+                insert_dive_team(self.db_manager, dive_id, dlg.team_members)
                 
                 # Refresh the dive list
                 self.refresh_data()
@@ -1185,7 +1468,7 @@ class DiveLogWidget(QWidget):
         reply = QMessageBox.question(
             self,
             self.tr("Confirm Delete"),
-            self.tr(f"Delete dive log {dive_number}?"),
+            self.tr("Delete dive log {0}?").format(dive_number),
             QMessageBox.Yes | QMessageBox.No
         )
         
@@ -1224,10 +1507,7 @@ class DiveLogWidget(QWidget):
         
         # Import the generator
         try:
-            import sys
-            import os
-            sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            from utils.report_generator import DiveLogReportGenerator
+            DiveLogReportGenerator = self.get_report_generator_class()
             
             # Get save location
             from qgis.PyQt.QtWidgets import QFileDialog
@@ -1254,7 +1534,7 @@ class DiveLogWidget(QWidget):
                 QMessageBox.information(
                     self,
                     self.tr("Success"),
-                    self.tr(f"Dive log report saved to:\n{filename}")
+                    self.tr("Dive log report saved to:\n{0}").format(filename)
                 )
                 
                 # Ask if user wants to open the file
@@ -1266,28 +1546,28 @@ class DiveLogWidget(QWidget):
                 )
                 
                 if reply == QMessageBox.Yes:
-                    import subprocess
-                    import platform
-                    if platform.system() == 'Darwin':  # macOS
-                        subprocess.call(['open', filename])
-                    elif platform.system() == 'Windows':
-                        os.startfile(filename)
-                    else:  # Linux
-                        subprocess.call(['xdg-open', filename])
+                    QDesktopServices.openUrl(QUrl.fromLocalFile(filename))
                         
         except ImportError as e:
             QMessageBox.critical(
                 self,
                 self.tr("Error"),
-                self.tr(f"Could not import report generator:\n{str(e)}\n\nPlease ensure reportlab is installed.")
+                self.tr("Could not import report generator:\n{0}\n\nPlease ensure reportlab is installed.").format(str(e))
             )
         except Exception as e:
             QMessageBox.critical(
                 self,
                 self.tr("Error"),
-                self.tr(f"Error generating report:\n{str(e)}")
+                self.tr("Error generating report:\n{0}").format(str(e))
             )
     
+    def get_report_generator_class(self):
+        """Import the report generator on first use (the plugin folder is already on sys.path)"""
+        if self.report_generator_class is None:
+            from utils.report_generator import DiveLogReportGenerator
+            self.report_generator_class = DiveLogReportGenerator
+        return self.report_generator_class
+    
     def generate_batch_reports(self):
         """Generate reports for all dive logs"""
         # Get folder location
@@ -1302,23 +1582,7 @@ class DiveLogWidget(QWidget):
             return
         
         try:
-            import sys
-            import os
-            sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            from utils.report_generator import DiveLogReportGenerator
-            
-            # Get all dive logs
-            dives = self.db_manager.execute_query(
-                "SELECT id, dive_number FROM dive_logs ORDER BY dive_date"
-            )
-            
-            if not dives:
-                QMessageBox.information(
-                    self,
-                    self.tr("No Data"),
-                    self.tr("No dive logs found to generate reports")
-                )
-                return
+            DiveLogReportGenerator = self.get_report_generator_class()
             
             # Check if reportlab is available
             generator = DiveLogReportGenerator(self.db_manager)
@@ -1329,26 +1593,52 @@ class DiveLogWidget(QWidget):
                     self.tr("ReportLab is not installed.\n\nPlease install it with:\npip install reportlab qrcode pillow")
                 )
                 return
-                
-            # Generate reports
-            generated = 0
             
-            for dive in dives:
-                dive_id = dive['id'] if isinstance(dive, dict) else dive[0]
-                dive_number = dive['dive_number'] if isinstance(dive, dict) else dive[1]
-                
-                filename = os.path.join(folder, f"divelog_{dive_number}.pdf")
-                
-                try:
-                    generator.generate_dive_sheet(dive_id, filename)
-                    generated += 1
-                except Exception as e:
-                    print(f"Error generating report for {dive_number}: {e}")
+            # Get all dive logs with their teams up front
+            sheets = generator.get_dive_sheets_data()
+            
+            if not sheets:
+                QMessageBox.information(
+                    self,
+                    self.tr("No Data"),
+                    self.tr("No dive logs found to generate reports")
+                )
+                return
+            
+            # Write the PDFs in the background
+            progress = QProgressDialog(
+                self.tr("Generating dive log reports..."), self.tr("Cancel"),
+                0, len(sheets), self
+            )
+            progress.setWindowModality(Qt.WindowModal)
+            progress.setMinimumDuration(0)
             
+            worker = BatchReportWorker(sheets, folder)
+            worker.report_done.connect(progress.setValue)
+            progress.canceled.connect(worker.requestInterruption)
+            worker.finished.connect(lambda: self.on_batch_reports_finished(worker, progress))
+            _running_workers.add(worker)
+            worker.start()
+                    
+        except Exception as e:
+            QMessageBox.critical(
+                self,
+                self.tr("Error"),
+                self.tr("Error generating batch reports:\n{0}").format(str(e))
+            )
+    
+    def on_batch_reports_finished(self, worker, progress):
+        """Report the generated dive log PDFs"""
+        _running_workers.discard(worker)
+        progress.close()
+        folder = worker.folder
+        generated = worker.generated
+        
+        try:
             QMessageBox.information(
                 self,
                 self.tr("Success"),
-                self.tr(f"Generated {generated} dive log reports in:\n{folder}")
+                self.tr("Generated {0} dive log reports in:\n{1}").format(generated, folder)
             )
             
             # Ask if user wants to open the folder
@@ -1360,20 +1650,13 @@ class DiveLogWidget(QWidget):
             )
             
             if reply == QMessageBox.Yes:
-                import subprocess
-                import platform
-                if platform.system() == 'Darwin':  # macOS
-                    subprocess.call(['open', folder])
-                elif platform.system() == 'Windows':
-                    os.startfile(folder)
-                else:  # Linux
-                    subprocess.call(['xdg-open', folder])
+                QDesktopServices.openUrl(QUrl.fromLocalFile(folder))
                     
         except Exception as e:
             QMessageBox.critical(
                 self,
                 self.tr("Error"),
-                self.tr(f"Error generating batch reports:\n{str(e)}")
+                self.tr("Error generating batch reports:\n{0}").format(str(e))
             )
     
     def tr(self, message):
@@ -505,7 +505,7 @@ class FindDialog(QDialog):
             QMessageBox.information(
                 self,
                 self.tr("Success"),
-                self.tr(f"Added {added} image(s) to this find")
+                self.tr("Added {0} image(s) to this find").format(added)
             )
     
     def add_media_file(self, file_path):
@@ -551,7 +551,7 @@ class FindDialog(QDialog):
             QMessageBox.warning(
                 self,
                 self.tr("Error"),
-                self.tr(f"Failed to add image: {str(e)}")
+                self.tr("Failed to add image: {0}").format(str(e))
             )
             return False
     
@@ -310,9 +310,9 @@ class FindsWidget(QWidget):
         visible = sum(1 for row in range(total) if not self.finds_table.isRowHidden(row))
         
         if total == visible:
-            self.status_label.setText(self.tr(f"Total finds: {total}"))
+            self.status_label.setText(self.tr("Total finds: {0}").format(total))
         else:
-            self.status_label.setText(self.tr(f"Showing {visible} of {total} finds"))
+            self.status_label.setText(self.tr("Showing {0} of {1} finds").format(visible, total))
     
     def on_selection_changed(self):
         """Handle selection change"""
@@ -710,5 +710,5 @@ class FindsWidget(QWidget):
                 QMessageBox.critical(
                     self,
                     self.tr("Error"),
-                    self.tr(f"Export failed: {str(e)}")
+                    self.tr("Export failed: {0}").format(str(e))
                 )
\ No newline at end of file
@@ -149,11 +149,12 @@ class MediaListWidget(QWidget):
             
             # Update count
             count = len(media_items)
-            self.count_label.setText(self.tr(f"{count} media file{'s' if count != 1 else ''} attached"))
+            self.count_label.setText((self.tr("{0} media file attached") if count == 1
+                                     else self.tr("{0} media files attached")).format(count))
             
         except Exception as e:
             QMessageBox.warning(self, self.tr("Error"), 
-                              self.tr(f"Error loading media: {str(e)}"))
+                              self.tr("Error loading media: {0}").format(str(e)))
     
     def get_media_count(self):
         """Get the number of media items"""
@@ -190,7 +191,7 @@ class MediaListWidget(QWidget):
         
         if not full_path or not os.path.exists(full_path):
             QMessageBox.warning(self, self.tr("Error"), 
-                              self.tr(f"File not found: {file_path}"))
+                              self.tr("File not found: {0}").format(file_path))
             return
         
         media_type = media_data.get('media_type', '').lower()
@@ -249,7 +250,7 @@ class MediaListWidget(QWidget):
                 
         except Exception as e:
             QMessageBox.warning(self, self.tr("Error"), 
-                              self.tr(f"Error opening media: {str(e)}"))
+                              self.tr("Error opening media: {0}").format(str(e)))
     
     def tr(self, message):
         from qgis.PyQt.QtCore import QCoreApplication
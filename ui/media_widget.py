@@ -330,7 +330,7 @@ class MediaWidget(QWidget):
             QMessageBox.information(
                 self,
                 self.tr("Success"),
-                self.tr(f"Added {added} media file(s)")
+                self.tr("Added {0} media file(s)").format(added)
             )
     
     def add_media_file(self, file_path, related_type, related_id):
@@ -746,9 +746,9 @@ class MediaWidget(QWidget):
         visible = sum(1 for row in range(total) if not self.media_table.isRowHidden(row))
         
         if total == visible:
-            self.status_label.setText(self.tr(f"Total media files: {total}"))
+            self.status_label.setText(self.tr("Total media files: {0}").format(total))
         else:
-            self.status_label.setText(self.tr(f"Showing {visible} of {total} media files"))
+            self.status_label.setText(self.tr("Showing {0} of {1} media files").format(visible, total))
     
     def on_selection_changed(self):
         """Handle selection change"""
@@ -800,7 +800,7 @@ class MediaWidget(QWidget):
                 QMessageBox.warning(
                     self,
                     self.tr("File Not Found"),
-                    self.tr(f"File not found: {file_path}")
+                    self.tr("File not found: {0}").format(file_path)
                 )
                 return
             
@@ -1044,7 +1044,7 @@ class MediaWidget(QWidget):
                         QMessageBox.information(
                             self,
                             self.tr("Success"),
-                            self.tr(f"Media list exported to:\n{filename}")
+                            self.tr("Media list exported to:\n{0}").format(filename)
                         )
                         
                         # Ask if user wants to open the file
@@ -1075,7 +1075,7 @@ class MediaWidget(QWidget):
                     QMessageBox.critical(
                         self,
                         self.tr("Error"),
-                        self.tr(f"Error exporting media list:\n{str(e)}")
+                        self.tr("Error exporting media list:\n{0}").format(str(e))
                     )
     
     def tr(self, message):
@@ -251,12 +251,12 @@ class ModelViewerWidget(QWidget):
         # Update info
         file_info = os.path.basename(file_path)
         file_size = os.path.getsize(file_path) / (1024 * 1024)  # MB
-        info_text = self.tr(f"Model: {file_info}\nSize: {file_size:.2f} MB")
+        info_text = self.tr("Model: {0}\nSize: {1:.2f} MB").format(file_info, file_size)
         
         if os.path.exists(mtl_path):
             info_text += self.tr("\nMTL file found")
         if texture_found:
-            info_text += self.tr(f"\nTexture: {os.path.basename(self.current_texture_path)}")
+            info_text += self.tr("\nTexture: {0}").format(os.path.basename(self.current_texture_path))
         else:
             info_text += self.tr("\nNo texture found")
             
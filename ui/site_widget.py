@@ -433,9 +433,9 @@ class SiteWidget(QWidget):
         visible = sum(1 for row in range(total) if not self.sites_table.isRowHidden(row))
         
         if total == visible:
-            self.status_label.setText(self.tr(f"Total sites: {total}"))
+            self.status_label.setText(self.tr("Total sites: {0}").format(total))
         else:
-            self.status_label.setText(self.tr(f"Showing {visible} of {total} sites"))
+            self.status_label.setText(self.tr("Showing {0} of {1} sites").format(visible, total))
     
     def on_selection_changed(self):
         """Handle selection change"""
@@ -531,14 +531,14 @@ class SiteWidget(QWidget):
             QMessageBox.warning(
                 self,
                 self.tr("Cannot Delete"),
-                self.tr(f"Cannot delete site '{site_name}' because it has {count} associated finds")
+                self.tr("Cannot delete site '{0}' because it has {1} associated finds").format(site_name, count)
             )
             return
         
         reply = QMessageBox.question(
             self,
             self.tr("Confirm Delete"),
-            self.tr(f"Are you sure you want to delete site '{site_name}'?"),
+            self.tr("Are you sure you want to delete site '{0}'?").format(site_name),
             QMessageBox.Yes | QMessageBox.No
         )
         
@@ -181,7 +181,7 @@ class VideoPlayerWidget(QWidget):
         file_info = os.path.basename(file_path)
         file_size = os.path.getsize(file_path) / (1024 * 1024)  # MB
         self.info_label.setText(
-            self.tr(f"Video: {file_info}\nSize: {file_size:.2f} MB")
+            self.tr("Video: {0}\nSize: {1:.2f} MB").format(file_info, file_size)
         )
         
         if MULTIMEDIA_AVAILABLE:
@@ -200,14 +200,14 @@ class VideoPlayerWidget(QWidget):
             
             if file_ext not in supported_formats:
                 self.info_label.setText(
-                    self.tr(f"Video loaded. Format '{file_ext}' may not be supported.\n"
-                          f"Supported formats: {', '.join(supported_formats)}\n"
-                          f"Try 'Open in External Player' if playback fails.")
+                    self.tr("Video loaded. Format '{0}' may not be supported.\n"
+                          "Supported formats: {1}\n"
+                          "Try 'Open in External Player' if playback fails.").format(file_ext, ', '.join(supported_formats))
                 )
             else:
                 self.info_label.setText(
-                    self.tr(f"Video loaded. Click Play to start.\n"
-                          f"If playback doesn't work, try 'Open in External Player'.")
+                    self.tr("Video loaded. Click Play to start.\n"
+                          "If playback doesn't work, try 'Open in External Player'.")
                 )
         else:
             # Show preview frame if possible
@@ -322,9 +322,9 @@ class VideoPlayerWidget(QWidget):
             QMessageBox.warning(
                 self,
                 self.tr("Playback Error"),
-                self.tr(f"Error playing video: {error}\n\n"
-                      f"Try using 'Open in External Player' if the format is not supported.\n"
-                      f"Qt Multimedia may have limited codec support on some systems.")
+                self.tr("Error playing video: {0}\n\n"
+                      "Try using 'Open in External Player' if the format is not supported.\n"
+                      "Qt Multimedia may have limited codec support on some systems.").format(error)
             )
             
             # Suggest opening in external player
@@ -398,7 +398,7 @@ class VideoPlayerWidget(QWidget):
             QMessageBox.warning(
                 self,
                 self.tr("Error"),
-                self.tr(f"Failed to open video: {str(e)}")
+                self.tr("Failed to open video: {0}").format(str(e))
             )
             
     def tr(self, message):
@@ -11,6 +11,27 @@ from qgis.PyQt.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
 from qgis.PyQt.QtGui import QIcon
 from datetime import datetime, date
 
+# Active workers per database manager, shared by the dialogs that pick workers
+_active_workers_cache = {}
+
+
+def get_active_workers(db_manager):
+    """Return (id, full_name) tuples of active workers, cached until workers change"""
+    workers = _active_workers_cache.get(db_manager)
+    if workers is None:
+        rows = db_manager.execute_query(
+            "SELECT id, full_name FROM workers WHERE active = 1 ORDER BY full_name"
+        ) or []
+        workers = [(row['id'], row['full_name']) for row in rows]
+        _active_workers_cache[db_manager] = workers
+    return workers
+
+
+def clear_active_workers_cache():
+    """Forget the cached active workers after workers were added, edited or removed"""
+    _active_workers_cache.clear()
+
+
 class WorkerDialog(QDialog):
     """Dialog for adding/editing workers"""
     
@@ -488,6 +509,9 @@ class WorkersWidget(QWidget):
     
     def load_workers(self):
         """Load workers list"""
+        # Workers are reloaded after every change, so refresh the shared cache too
+        clear_active_workers_cache()
+        
         # Clear the table first
         self.workers_table.setRowCount(0)
         self.worker_combo.clear()
@@ -665,7 +689,7 @@ class WorkersWidget(QWidget):
         
         # Update summary
         self.summary_label.setText(
-            self.tr(f"Total: {total_hours:.1f} hours | IDR {total_payment:,.0f}")
+            self.tr("Total: {0:.1f} hours | IDR {1:,.0f}").format(total_hours, total_payment)
         )
     
     def on_worker_selection_changed(self):
@@ -769,7 +793,7 @@ class WorkersWidget(QWidget):
             reply = QMessageBox.question(
                 self,
                 self.tr("Deactivate Worker"),
-                self.tr(f"Worker '{worker_name}' has work sessions. Deactivate instead of delete?"),
+                self.tr("Worker '{0}' has work sessions. Deactivate instead of delete?").format(worker_name),
                 QMessageBox.Yes | QMessageBox.No
             )
             
@@ -792,7 +816,7 @@ class WorkersWidget(QWidget):
             reply = QMessageBox.question(
                 self,
                 self.tr("Confirm Delete"),
-                self.tr(f"Delete worker '{worker_name}'?"),
+                self.tr("Delete worker '{0}'?").format(worker_name),
                 QMessageBox.Yes | QMessageBox.No
             )
             
@@ -38,7 +38,74 @@ class DiveLogReportGenerator(QObject):
         """Generate a dive log sheet with signature information"""
         if not REPORTLAB_AVAILABLE:
             raise ImportError("ReportLab is not installed. Please install it with: pip install reportlab qrcode")
-            
+        
+        sheet = self.get_dive_sheet_data(dive_id)
+        if sheet is None:
+            return None
+        
+        dive, team = sheet
+        return render_dive_sheet(dive, team, output_path)
+    
+    def get_dive_sheets_data(self):
+        """Get (dive, team) of every dive log sheet, ordered by dive date, with three queries"""
+        if hasattr(self.db_manager, 'supabase'):
+            # The Supabase manager does not support joined queries, fetch each dive
+            dives = self.db_manager.execute_query(
+                "SELECT id, dive_number FROM dive_logs ORDER BY dive_date"
+            )
+            sheets = (self.get_dive_sheet_data(dive['id']) for dive in dives or [])
+            return [sheet for sheet in sheets if sheet is not None]
+        
+        dives = self.db_manager.execute_query(
+            """SELECT d.*, s.site_name, s.site_code
+               FROM dive_logs d
+               LEFT JOIN sites s ON s.id = d.site_id
+               ORDER BY d.dive_date"""
+        )
+        if not dives:
+            return []
+        
+        members = self.db_manager.execute_query(
+            """SELECT dt.dive_id, dt.worker_id, dt.role, w.full_name, w.worker_code,
+                      w.dive_certification, w.telegram_username
+               FROM dive_team dt
+               JOIN workers w ON w.id = dt.worker_id"""
+        )
+        signatures = self.db_manager.execute_query(
+            "SELECT * FROM dive_log_signatures"
+        )
+        
+        signature_by_member = {}
+        for sig in signatures or []:
+            sig = dict(sig)
+            signature_by_member.setdefault((sig['dive_log_id'], sig['worker_id']), sig)
+        
+        teams = {}
+        for member in members or []:
+            member = dict(member)
+            sig = signature_by_member.get((member['dive_id'], member['worker_id']), {})
+            teams.setdefault(member['dive_id'], []).append({
+                'worker_id': member['worker_id'],
+                'role': member['role'],
+                'full_name': member['full_name'],
+                'worker_code': member['worker_code'],
+                'dive_certification': member.get('dive_certification') or '',
+                'bottom_time': None,  # These fields don't exist in the current schema
+                'decompression_time': None,
+                'air_consumed': None,
+                'signature_hash': sig.get('signature_hash'),
+                'signature_timestamp': sig.get('created_at'),
+                'telegram_username': member.get('telegram_username')
+            })
+        
+        sheets = []
+        for dive in dives:
+            dive = dict(dive)
+            sheets.append((dive, teams.get(dive['id'], [])))
+        return sheets
+    
+    def get_dive_sheet_data(self, dive_id):
+        """Get the dive and its team for a dive log sheet, None if the dive does not exist"""
         # Get dive information
         dive_logs = self.db_manager.execute_query(
             "SELECT * FROM dive_logs WHERE id = ?",
@@ -129,141 +196,146 @@ class DiveLogReportGenerator(QObject):
                 }
                 team.append(team_data)
         
-        # Create PDF
-        doc = SimpleDocTemplate(output_path, pagesize=A4,
-                              rightMargin=15*mm, leftMargin=15*mm,
-                              topMargin=15*mm, bottomMargin=15*mm)
-        
-        elements = []
-        styles = getSampleStyleSheet()
-        
-        # Title
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=16,
-            textColor=colors.HexColor('#000000'),
-            spaceAfter=10,
-            alignment=TA_CENTER
-        )
-        
-        elements.append(Paragraph("DIVE LOG SHEET", title_style))
-        elements.append(Spacer(1, 10*mm))
-        
-        # Dive site info header  
-        site_name = dive['site_name'] if isinstance(dive, dict) else dive[10]
-        site_code = dive['site_code'] if isinstance(dive, dict) else dive[11]
-        dive_date = dive['dive_date'] if isinstance(dive, dict) else dive[3]
-        dive_number = dive['dive_number'] if isinstance(dive, dict) else dive[2]
-        
-        header_data = [
-            ['Dive Site:', site_name, '', 'Site Code:', site_code],
-            ['Date:', dive_date, '', 'Dive Nr:', dive_number]
-        ]
-        
-        header_table = Table(header_data, colWidths=[25*mm, 55*mm, 20*mm, 25*mm, 55*mm])
-        header_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (3, 0), (3, -1), 'Helvetica-Bold'),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ]))
-        
-        elements.append(header_table)
-        elements.append(Spacer(1, 5*mm))
-        
-        # Extract dive info
-        dive_start = dive['dive_start'] if isinstance(dive, dict) else dive[4]
-        dive_end = dive['dive_end'] if isinstance(dive, dict) else dive[5]
-        max_depth = dive['max_depth'] if isinstance(dive, dict) else dive[6]
-        avg_depth = dive['avg_depth'] if isinstance(dive, dict) else dive[7]
-        water_temp = dive['water_temp'] if isinstance(dive, dict) else dive[8]
-        visibility = dive['visibility'] if isinstance(dive, dict) else dive[9]
-        
-        # Dive information
-        info_data = [
-            ['Start Time:', dive_start or '', 'End Time:', dive_end or ''],
-            ['Max Depth:', f"{max_depth}m" if max_depth else "", 'Avg Depth:', f"{avg_depth}m" if avg_depth else ""],
-            ['Water Temp:', f"{water_temp}°C" if water_temp else "", 'Visibility:', f"{visibility}m" if visibility else ""]
-        ]
-        
-        info_table = Table(info_data, colWidths=[25*mm, 65*mm, 25*mm, 65*mm])
-        info_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (2, 0), (2, -1), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 3),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 3),
-        ]))
-        
-        elements.append(info_table)
-        elements.append(Spacer(1, 10*mm))
-        
-        # Team members table with signature status
-        team_header = ['Name', 'Role', 'Bottom Time', 'Deco Time', 'Air (BAR)', 'Signature']
-        team_data = [team_header]
-        
-        for member in team:
-            # Extract member data
-            if isinstance(member, dict):
-                full_name = member['full_name']
-                role = member['role'] or ""
-                bottom_time = member['bottom_time']
-                decompression_time = member['decompression_time']
-                air_consumed = member['air_consumed']
-                signature_hash = member['signature_hash']
-                signature_timestamp = member['signature_timestamp']
-            else:
-                full_name = member[5]  # Adjust indices based on query
-                role = member[3] or ""
-                bottom_time = member[4]
-                decompression_time = member[5]
-                air_consumed = member[6]
-                signature_hash = member[8] if len(member) > 8 else None
-                signature_timestamp = member[9] if len(member) > 9 else None
-            
-            # Signature field
-            if signature_hash:
-                signature_text = f"✓ Signed\n{signature_timestamp[:10] if signature_timestamp else ''}"
-            else:
-                signature_text = "Pending"
-            
-            team_data.append([
-                full_name,
-                role,
-                f"{bottom_time} min" if bottom_time else "",
-                f"{decompression_time} min" if decompression_time else "",
-                str(air_consumed) if air_consumed else "",
-                signature_text
-            ])
-        
-        # Add empty rows
-        for i in range(max(5 - len(team), 0)):
-            team_data.append(["", "", "", "", "", ""])
-        
-        team_table = Table(team_data, colWidths=[40*mm, 30*mm, 25*mm, 25*mm, 20*mm, 30*mm])
-        team_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('ALIGN', (2, 0), (4, -1), 'CENTER'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 3),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 3),
-            ('ROWHEIGHTS', (0, 1), (-1, -1), 15*mm),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-        ]))
-        
-        elements.append(Paragraph("Dive Team", styles['Heading2']))
-        elements.append(Spacer(1, 5*mm))
-        elements.append(team_table)
+        return dive, team
+
+
+def render_dive_sheet(dive, team, output_path):
+    """Write the PDF sheet of a dive and its team, without any database access"""
+    # Create PDF
+    doc = SimpleDocTemplate(output_path, pagesize=A4,
+                          rightMargin=15*mm, leftMargin=15*mm,
+                          topMargin=15*mm, bottomMargin=15*mm)
+    
+    elements = []
+    styles = getSampleStyleSheet()
+    
+    # Title
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=16,
+        textColor=colors.HexColor('#000000'),
+        spaceAfter=10,
+        alignment=TA_CENTER
+    )
+    
+    elements.append(Paragraph("DIVE LOG SHEET", title_style))
+    elements.append(Spacer(1, 10*mm))
+    
+    # Dive site info header  
+    site_name = dive['site_name'] if isinstance(dive, dict) else dive[10]
+    site_code = dive['site_code'] if isinstance(dive, dict) else dive[11]
+    dive_date = dive['dive_date'] if isinstance(dive, dict) else dive[3]
+    dive_number = dive['dive_number'] if isinstance(dive, dict) else dive[2]
+    
+    header_data = [
+        ['Dive Site:', site_name, '', 'Site Code:', site_code],
+        ['Date:', dive_date, '', 'Dive Nr:', dive_number]
+    ]
+    
+    header_table = Table(header_data, colWidths=[25*mm, 55*mm, 20*mm, 25*mm, 55*mm])
+    header_table.setStyle(TableStyle([
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTNAME', (3, 0), (3, -1), 'Helvetica-Bold'),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ]))
+    
+    elements.append(header_table)
+    elements.append(Spacer(1, 5*mm))
+    
+    # Extract dive info
+    dive_start = dive['dive_start'] if isinstance(dive, dict) else dive[4]
+    dive_end = dive['dive_end'] if isinstance(dive, dict) else dive[5]
+    max_depth = dive['max_depth'] if isinstance(dive, dict) else dive[6]
+    avg_depth = dive['avg_depth'] if isinstance(dive, dict) else dive[7]
+    water_temp = dive['water_temp'] if isinstance(dive, dict) else dive[8]
+    visibility = dive['visibility'] if isinstance(dive, dict) else dive[9]
+    
+    # Dive information
+    info_data = [
+        ['Start Time:', dive_start or '', 'End Time:', dive_end or ''],
+        ['Max Depth:', f"{max_depth}m" if max_depth else "", 'Avg Depth:', f"{avg_depth}m" if avg_depth else ""],
+        ['Water Temp:', f"{water_temp}°C" if water_temp else "", 'Visibility:', f"{visibility}m" if visibility else ""]
+    ]
+    
+    info_table = Table(info_data, colWidths=[25*mm, 65*mm, 25*mm, 65*mm])
+    info_table.setStyle(TableStyle([
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTNAME', (2, 0), (2, -1), 'Helvetica-Bold'),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('LEFTPADDING', (0, 0), (-1, -1), 3),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 3),
+    ]))
+    
+    elements.append(info_table)
+    elements.append(Spacer(1, 10*mm))
+    
+    # Team members table with signature status
+    team_header = ['Name', 'Role', 'Bottom Time', 'Deco Time', 'Air (BAR)', 'Signature']
+    team_data = [team_header]
+    
+    for member in team:
+        # Extract member data
+        if isinstance(member, dict):
+            full_name = member['full_name']
+            role = member['role'] or ""
+            bottom_time = member['bottom_time']
+            decompression_time = member['decompression_time']
+            air_consumed = member['air_consumed']
+            signature_hash = member['signature_hash']
+            signature_timestamp = member['signature_timestamp']
+        else:
+            full_name = member[5]  # Adjust indices based on query
+            role = member[3] or ""
+            bottom_time = member[4]
+            decompression_time = member[5]
+            air_consumed = member[6]
+            signature_hash = member[8] if len(member) > 8 else None
+            signature_timestamp = member[9] if len(member) > 9 else None
         
-        # Build PDF
-        doc.build(elements)
+        # Signature field
+        if signature_hash:
+            signature_text = f"✓ Signed\n{signature_timestamp[:10] if signature_timestamp else ''}"
+        else:
+            signature_text = "Pending"
         
-        return output_path
\ No newline at end of file
+        team_data.append([
+            full_name,
+            role,
+            f"{bottom_time} min" if bottom_time else "",
+            f"{decompression_time} min" if decompression_time else "",
+            str(air_consumed) if air_consumed else "",
+            signature_text
+        ])
+    
+    # Add empty rows
+    for i in range(max(5 - len(team), 0)):
+        team_data.append(["", "", "", "", "", ""])
+    
+    team_table = Table(team_data, colWidths=[40*mm, 30*mm, 25*mm, 25*mm, 20*mm, 30*mm])
+    team_table.setStyle(TableStyle([
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('ALIGN', (2, 0), (4, -1), 'CENTER'),
+        ('LEFTPADDING', (0, 0), (-1, -1), 3),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 3),
+        ('ROWHEIGHTS', (0, 1), (-1, -1), 15*mm),
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+    ]))
+    
+    elements.append(Paragraph("Dive Team", styles['Heading2']))
+    elements.append(Spacer(1, 5*mm))
+    elements.append(team_table)
+    
+    # Build PDF
+    doc.build(elements)
+    
+    return output_path
\ No newline at end of file